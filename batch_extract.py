@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Convert every Toggl PDF in a directory (or matching a glob) to CSV.
+
+    python batch_extract.py reportes_csv/
+    python batch_extract.py 'reportes_csv/intek*.pdf' --jobs 4 --force
+    python batch_extract.py reportes_csv/ -o out/ --format parquet
+
+Each PDF is handled by its own worker process. A CSV is considered up to
+date when it is newer than its PDF, or when the PDF hash recorded for it
+in the output directory's manifest still matches.
+"""
+import argparse
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import entry_output
+import extract_intek_final
+import pdf_lines
+import report_stats
+import toggl_parser
+
+MANIFEST_NAME = '.batch_manifest.json'
+SUMMARY_NAME = 'batch_summary.json'
+
+
+def find_pdfs(target):
+    if os.path.isdir(target):
+        paths = glob.glob(os.path.join(target, '*.pdf'))
+    else:
+        paths = glob.glob(target)
+    return sorted(path for path in paths if path.lower().endswith('.pdf'))
+
+
+def load_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(output_dir, manifest):
+    with open(os.path.join(output_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def is_up_to_date(pdf_path, csv_path, digest, manifest):
+    if not os.path.exists(csv_path):
+        return False
+    if os.path.getmtime(csv_path) >= os.path.getmtime(pdf_path):
+        return True
+    return manifest.get(os.path.basename(csv_path)) == digest
+
+
+def convert(pdf_path, csv_path, use_cache=True):
+    """Extract, parse and write one report. Runs inside a worker process."""
+    start = time.perf_counter()
+    cache_dir = pdf_lines.CACHE_DIR if use_cache else None
+    pages, _ = pdf_lines.cached_extract(pdf_path, 1, cache_dir)
+    entries = toggl_parser.parse_entries(pdf_lines.flatten(pages))
+    extract_intek_final.write_entries(entries, csv_path)
+    columns = report_stats.EntryColumns()
+    columns.extend(entries)
+    return {
+        'entries': len(columns),
+        'total_seconds': columns.total_seconds(),
+        'members': dict(sorted(columns.member_counts().items())),
+        'seconds': round(time.perf_counter() - start, 3),
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Convert a directory of Toggl PDF reports into CSVs')
+    arg_parser.add_argument('target', help='directory containing PDFs, or a glob such as "reportes_csv/*.pdf"')
+    arg_parser.add_argument('-o', '--output-dir', help='where to write CSVs (default: next to each PDF)')
+    arg_parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                            help='maximum PDFs converted at once')
+    arg_parser.add_argument('--format', choices=sorted(set(entry_output.FORMATS.values())), default='csv',
+                            help='output format (parquet/arrow need pyarrow, csv.zst needs zstandard)')
+    arg_parser.add_argument('--force', action='store_true', help='convert even if the CSV is up to date')
+    arg_parser.add_argument('--no-cache', action='store_true',
+                            help='always re-extract instead of using the extracted-lines cache')
+    arg_parser.add_argument('--summary', help=f'run summary JSON path (default: <output dir>/{SUMMARY_NAME})')
+    args = arg_parser.parse_args()
+
+    pdf_paths = find_pdfs(args.target)
+    if not pdf_paths:
+        print(f"No PDFs found for {args.target}")
+        return 1
+
+    run_start = time.perf_counter()
+    results = []
+    manifests = {}
+    jobs = {}
+    with ProcessPoolExecutor(max_workers=max(1, min(args.jobs, len(pdf_paths)))) as pool:
+        for pdf_path in pdf_paths:
+            output_dir = args.output_dir or os.path.dirname(pdf_path) or '.'
+            os.makedirs(output_dir, exist_ok=True)
+            if output_dir not in manifests:
+                manifests[output_dir] = load_manifest(output_dir)
+            csv_path = extract_intek_final.default_output_path(pdf_path, output_dir, args.format)
+            digest = pdf_lines.file_digest(pdf_path)
+            result = {'pdf': pdf_path, 'csv': csv_path, 'sha256': digest}
+            results.append(result)
+            if not args.force and is_up_to_date(pdf_path, csv_path, digest, manifests[output_dir]):
+                result['status'] = 'skipped'
+                continue
+            jobs[pool.submit(convert, pdf_path, csv_path, not args.no_cache)] = (result, output_dir)
+
+        for future, (result, output_dir) in jobs.items():
+            try:
+                result.update(future.result())
+                result['status'] = 'converted'
+                manifests[output_dir][os.path.basename(result['csv'])] = result['sha256']
+            except Exception as e:
+                result['status'] = 'error'
+                result['error'] = str(e)
+
+    for output_dir, manifest in manifests.items():
+        save_manifest(output_dir, manifest)
+
+    elapsed = time.perf_counter() - run_start
+    converted = [r for r in results if r['status'] == 'converted']
+    summary = {
+        'target': args.target,
+        'elapsed_seconds': round(elapsed, 3),
+        'converted': len(converted),
+        'skipped': sum(1 for r in results if r['status'] == 'skipped'),
+        'errors': sum(1 for r in results if r['status'] == 'error'),
+        'entries': sum(r['entries'] for r in converted),
+        'total_seconds': sum(r['total_seconds'] for r in converted),
+        'files': results,
+    }
+
+    for r in results:
+        if r['status'] == 'converted':
+            detail = f"{r['entries']:>5} entries, {report_stats.format_duration(r['total_seconds'], pad_hours=False):>10}, {r['seconds']:.2f}s"
+        elif r['status'] == 'error':
+            detail = r['error']
+        else:
+            detail = 'up to date'
+        print(f"{r['status']:>9}  {os.path.basename(r['pdf'])}: {detail}")
+    print(f"\n✅ {summary['converted']} converted, {summary['skipped']} skipped, {summary['errors']} errors "
+          f"- {summary['entries']} entries, {report_stats.format_duration(summary['total_seconds'], pad_hours=False)} in {elapsed:.2f}s")
+
+    summary_path = args.summary or os.path.join(args.output_dir or os.path.dirname(pdf_paths[0]) or '.', SUMMARY_NAME)
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    print(f"✅ Summary saved to {summary_path}")
+    return 1 if summary['errors'] else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""Benchmark the extraction pipeline.
+
+Runs every PDF in reportes_csv/ through extraction, parsing and CSV
+writing, then parses synthetic corpora built by repeating a real report's
+lines up to 10k..1M lines, and optionally reports generated by
+synth_report.py with a known entry count. Each case runs in a fresh process so its peak
+RSS is its own; the memory held by the parsed entries themselves is
+reported next to it. Results are saved as JSON and can be compared against an
+earlier run:
+
+    python benchmark.py
+    python benchmark.py --scales 10000 100000 --parsers fast legacy
+    python benchmark.py --compare bench_results/20261017-101500.json
+    python benchmark.py --no-pdfs --scales --generated 10000 100000
+    python benchmark.py --scales --raw          # pdfplumber vs the PDFium text stream
+    python benchmark.py --no-pdfs --scales --adapters 10000 100000   # Toggl exports vs parsing report text
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import extract_intek_final
+import input_adapters
+import pdf_lines
+import raw_extract
+import synth_report
+import toggl_parser
+
+PARSERS = {
+    'fast': toggl_parser.parse_entries,
+    'legacy': extract_intek_final.parse_entries,
+}
+DEFAULT_SCALES = [10000, 100000, 1000000]
+# input_adapters formats benchmarked by --adapters, and the file each is generated as
+ADAPTER_SUFFIXES = {'csv': '.csv', 'toggl-csv': '.csv', 'json': '.json', 'jsonl': '.jsonl'}
+RESULTS_DIR = 'bench_results'
+# Phases compared between runs
+PHASES = ('extract_seconds', 'parse_seconds', 'write_seconds')
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def entries_mb(entries):
+    """Memory held by a parsed entry list: the list, every entry and each
+    distinct object its fields point to (shared strings count once)."""
+    seen = set()
+    size = sys.getsizeof(entries)
+    for entry in entries:
+        size += sys.getsizeof(entry)
+        values = entry.values() if isinstance(entry, dict) else (getattr(entry, name) for name in entry.__slots__)
+        for value in values:
+            if id(value) not in seen:
+                seen.add(id(value))
+                size += sys.getsizeof(value)
+    return size / (1024 * 1024)
+
+
+def scaled_lines(base_lines, size):
+    """Repeat base_lines (whole copies, then a prefix) until there are `size` lines."""
+    copies, rest = divmod(size, len(base_lines))
+    return base_lines * copies + base_lines[:rest]
+
+
+def _finish(result, entries):
+    """Time writing entries as CSV and record the counts and memory every case reports."""
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        extract_intek_final.write_csv(entries, os.path.join(tmp, 'out.csv'))
+        result['write_seconds'] = time.perf_counter() - start
+
+    result['entries'] = len(entries)
+    result['entries_mb'] = round(entries_mb(entries), 1)
+    result['entries_per_second'] = len(entries) / result['parse_seconds'] if result['parse_seconds'] else None
+    result['peak_rss_mb'] = round(peak_rss_mb(), 1)
+    return result
+
+
+def run_case(case):
+    """Run one benchmark case. Called in a fresh worker process."""
+    result = dict(case)
+    if case['kind'] == 'pdf' and case['parser'] == 'raw':
+        return run_raw_case(result)
+    if case['kind'] == 'adapter':
+        return run_adapter_case(result)
+    if case['kind'] == 'pdf':
+        start = time.perf_counter()
+        lines = pdf_lines.extract_lines(case['source'])
+        result['extract_seconds'] = time.perf_counter() - start
+    elif case['kind'] == 'generated':
+        lines = list(synth_report.render_lines(case['entries_generated']))
+        result['extract_seconds'] = None
+    else:
+        lines = scaled_lines(pdf_lines.load_lines(case['source']), case['lines'])
+        result['extract_seconds'] = None
+    result['lines'] = len(lines)
+
+    start = time.perf_counter()
+    entries = PARSERS[case['parser']](lines)
+    result['parse_seconds'] = time.perf_counter() - start
+
+    return _finish(result, entries)
+
+
+def run_raw_case(result):
+    """run_case() for the PDFium text-stream engine, which extracts and parses on its own."""
+    start = time.perf_counter()
+    pages = raw_extract.read_pages(result['source'])
+    result['extract_seconds'] = time.perf_counter() - start
+    result['lines'] = sum(len(page['lines']) for page in pages)
+
+    start = time.perf_counter()
+    entries, reconciliation = raw_extract.parse_pages(pages)
+    result['parse_seconds'] = time.perf_counter() - start
+    result['reconciled'] = raw_extract.reconciles(reconciliation)
+
+    return _finish(result, entries)
+
+
+def run_adapter_case(result):
+    """run_case() for an input_adapters export: reading it is the parse, there is no extraction."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'export' + ADAPTER_SUFFIXES[result['parser']])
+        synth_report.write_export(path, result['parser'], result['entries_generated'])
+        with open(path, 'rb') as f:
+            result['lines'] = sum(1 for _ in f)
+        result['extract_seconds'] = None
+
+        start = time.perf_counter()
+        entries = list(input_adapters.read_entries(path, result['parser']))
+        result['parse_seconds'] = time.perf_counter() - start
+
+    return _finish(result, entries)
+
+
+def run_isolated(case):
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return pool.submit(run_case, case).result()
+
+
+def case_key(result):
+    return (result['kind'], os.path.basename(result['source']), result['parser'], result['lines'])
+
+
+def print_result(result):
+    extract = f"{result['extract_seconds']:7.2f}s" if result['extract_seconds'] is not None else '      - '
+    rate = f"{result['entries_per_second']:>10,.0f}/s" if result['entries_per_second'] else '          -  '
+    reconciled = ''
+    if 'reconciled' in result:
+        reconciled = '  reconciled' if result['reconciled'] else '  does not reconcile (falls back)'
+    print(f"{result['name'][:34]:<34} {result['parser']:<9} {result['lines']:>8} lines "
+          f"extract {extract}  parse {result['parse_seconds']:7.3f}s  write {result['write_seconds']:6.3f}s  "
+          f"{result['entries']:>7} entries {rate}  {result.get('entries_mb', 0):7.1f} MB held, "
+          f"{result['peak_rss_mb']:7.1f} MB peak{reconciled}")
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {case_key(r): r for r in json.load(f)['results']}
+    print(f"\nCompared with {baseline_path} (new / old, <1 is faster):")
+    for result in results:
+        old = baseline.get(case_key(result))
+        if not old:
+            continue
+        ratios = []
+        for phase in PHASES + ('entries_mb', 'peak_rss_mb'):
+            if result.get(phase) and old.get(phase):
+                ratios.append(f"{phase.replace('_seconds', '')} {result[phase] / old[phase]:.2f}x")
+        print(f"  {result['name'][:34]:<34} {result['parser']:<9} {', '.join(ratios)}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmark PDF extraction, parsing and CSV writing')
+    arg_parser.add_argument('--pdf-dir', default='reportes_csv')
+    arg_parser.add_argument('--base-pdf', default='reportes_csv/intek-medical-final.pdf',
+                            help='report whose lines are repeated for the synthetic corpora')
+    arg_parser.add_argument('--scales', type=int, nargs='*', default=DEFAULT_SCALES,
+                            help='synthetic corpus sizes in lines (none to skip)')
+    arg_parser.add_argument('--generated', type=int, nargs='*', default=[],
+                            help='synth_report.py report sizes in entries')
+    arg_parser.add_argument('--parsers', nargs='+', choices=sorted(PARSERS), default=['fast'])
+    arg_parser.add_argument('--raw', action='store_true',
+                            help='also run the PDFs through the PDFium text-stream engine (raw_extract)')
+    arg_parser.add_argument('--adapters', type=int, nargs='*', default=[],
+                            help='read synthetic Toggl exports of these sizes (entries) through every '
+                                 'input_adapters format, next to the generated report text of the same size')
+    arg_parser.add_argument('--no-pdfs', action='store_true', help='only run the synthetic corpora')
+    arg_parser.add_argument('-o', '--output', help=f'results JSON (default: {RESULTS_DIR}/<timestamp>.json)')
+    arg_parser.add_argument('--compare', metavar='JSON', help='earlier results to compare against')
+    args = arg_parser.parse_args()
+
+    cases = []
+    for parser in args.parsers:
+        if not args.no_pdfs:
+            for pdf_path in sorted(glob.glob(os.path.join(args.pdf_dir, '*.pdf'))):
+                cases.append({'kind': 'pdf', 'name': os.path.basename(pdf_path), 'source': pdf_path,
+                              'parser': parser, 'lines': None})
+        for size in args.scales:
+            cases.append({'kind': 'synthetic', 'name': f"synthetic x{size}", 'source': args.base_pdf,
+                          'parser': parser, 'lines': size})
+        for size in args.generated:
+            cases.append({'kind': 'generated', 'name': f"generated {size} entries", 'source': 'synth_report',
+                          'parser': parser, 'lines': None, 'entries_generated': size})
+
+    if args.raw and not args.no_pdfs:
+        for pdf_path in sorted(glob.glob(os.path.join(args.pdf_dir, '*.pdf'))):
+            cases.append({'kind': 'pdf', 'name': os.path.basename(pdf_path), 'source': pdf_path,
+                          'parser': 'raw', 'lines': None})
+
+    for size in args.adapters:
+        if size not in args.generated:
+            # The PDF path's parse of the same entries, for comparison
+            cases.append({'kind': 'generated', 'name': f"generated {size} entries", 'source': 'synth_report',
+                          'parser': 'fast', 'lines': None, 'entries_generated': size})
+        for fmt in ADAPTER_SUFFIXES:
+            cases.append({'kind': 'adapter', 'name': f"{fmt} export {size} entries", 'source': 'synth_report',
+                          'parser': fmt, 'lines': None, 'entries_generated': size})
+
+    # Make sure the synthetic cases don't pay for extracting their base report
+    if args.scales:
+        pdf_lines.load_lines(args.base_pdf)
+
+    results = []
+    for case in cases:
+        result = run_isolated(case)
+        print_result(result)
+        results.append(result)
+
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime('%Y%m%d-%H%M%S') + '.json')
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'results': results,
+        }, f, indent=2)
+    print(f"\n✅ Results saved to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
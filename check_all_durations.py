@@ -1,84 +1,42 @@
 #!/usr/bin/env python3
-import pdfplumber
-import re
+"""Totals of the duration lines by how the parser treated them.
 
-pdf_path = 'reportes_csv/intek-medical-final.pdf'
-with pdfplumber.open(pdf_path) as pdf:
-    text_lines = []
-    for page in pdf.pages:
-        page_text = page.extract_text()
-        if page_text:
-            text_lines.extend(page_text.split('\n'))
-    
-    # Find ALL duration patterns
-    all_durations = []
-    for i, line in enumerate(text_lines):
-        clean_line = line.strip()
-        # Skip the total line at the top
-        if i < 10 and '483:31:35' in clean_line:
-            continue
-        dur_matches = re.findall(r'(\d+):(\d{2}):(\d{2})', clean_line)
-        for match in dur_matches:
-            all_durations.append((i, clean_line, match))
-    
-    print(f"Total duration patterns found: {len(all_durations)}")
-    
-    # Find entries with member (our current capture)
-    entries_with_member = []
-    for i, line in enumerate(text_lines):
-        clean_line = line.strip()
-        dur_match = re.search(r'(\d+):(\d{2}):(\d{2})', clean_line)
-        if dur_match and any(member in clean_line for member in ['Dani', 'Alberto', 'Joan', 'Jordi']):
-            entries_with_member.append((i, clean_line, dur_match.groups()))
-    
-    print(f"Entries with member in same line: {len(entries_with_member)}")
-    
-    # Find durations near members (within 2 lines)
-    entries_near_member = []
-    for i, line in enumerate(text_lines):
-        clean_line = line.strip()
-        dur_match = re.search(r'(\d+):(\d{2}):(\d{2})', clean_line)
-        if dur_match:
-            # Check if there's a member nearby
-            has_member_nearby = False
-            member_name = None
-            for j in range(max(0, i-2), min(len(text_lines), i+3)):
-                nearby = text_lines[j].strip()
-                for member in ['Dani', 'Alberto', 'Joan', 'Jordi']:
-                    if member in nearby:
-                        has_member_nearby = True
-                        member_name = member
-                        break
-                if has_member_nearby:
-                    break
-            
-            if has_member_nearby and (i, clean_line, dur_match.groups()) not in entries_with_member:
-                entries_near_member.append((i, clean_line, dur_match.groups(), member_name))
-    
-    print(f"Entries with member nearby (not in same line): {len(entries_near_member)}")
-    if entries_near_member:
-        print("\nFirst few entries with member nearby:")
-        for idx, (line_num, line, dur, member) in enumerate(entries_near_member[:10]):
-            print(f"  Line {line_num}: {line[:80]} -> Member: {member}")
-    
-    # Calculate totals
-    total_with_member = sum(
-        int(h)*3600 + int(m)*60 + int(s) 
-        for _, _, (h, m, s) in entries_with_member
-    )
-    
-    total_near_member = sum(
-        int(h)*3600 + int(m)*60 + int(s) 
-        for _, _, (h, m, s), _ in entries_near_member
-    )
-    
-    combined_total = total_with_member + total_near_member
-    h = combined_total // 3600
-    m = (combined_total % 3600) // 60
-    s = combined_total % 60
-    
-    print(f"\nTotal with member in same line: {total_with_member // 3600}:{(total_with_member % 3600) // 60:02d}:{total_with_member % 60:02d}")
-    if total_near_member > 0:
-        print(f"Total with member nearby: {total_near_member // 3600}:{(total_near_member % 3600) // 60:02d}:{total_near_member % 60:02d}")
-        print(f"Combined total: {h}:{m:02d}:{s:02d}")
+    python check_all_durations.py --pdf reportes_csv/intek-medical-final.pdf
 
+A summary view of diagnostics.py's classification.
+"""
+import argparse
+
+import diagnostics
+import report_stats
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Totals of duration lines with a member on or near the line')
+    arg_parser.add_argument('--pdf', default='reportes_csv/intek-medical-final.pdf', help='report to inspect')
+    args = arg_parser.parse_args()
+
+    report = diagnostics.load_report(args.pdf)
+    kinds = report['kinds']
+    print(f"Total duration patterns found: {len(report['lines'])}")
+    print(f"Entries captured: {kinds['captured']['lines']}")
+    near = [record for record in report['lines'] if record['kind'] in diagnostics.MISSED]
+    print(f"Duration lines with a member on or near them but no entry: {len(near)}")
+    if near:
+        print("\nFirst few of them:")
+        for record in near[:10]:
+            print(f"  Line {record['line']}: {record['text'][:80]} -> Member: {record['member']}")
+
+    captured = kinds['captured']['seconds']
+    missed = sum(record['seconds'] for record in near)
+    print(f"\nTotal captured: {report_stats.format_duration(captured, pad_hours=False)}")
+    if missed:
+        print(f"Total with member nearby: {report_stats.format_duration(missed, pad_hours=False)}")
+        print(f"Combined total: {report_stats.format_duration(captured + missed, pad_hours=False)}")
+    if report['header_total'] is not None:
+        print(f"Header total: {report_stats.format_duration(report['header_total'], pad_hours=False)}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""Load extracted time entries into the app's database.
+
+    python db_loader.py reportes_csv/*.csv                      # POSTGRES_URL / DATABASE_URL
+    python db_loader.py reportes_csv/*.pdf --report-id intek-2025
+    python db_loader.py 'reportes_csv/*.csv' --sqlite /tmp/entries.db
+    python db_loader.py toggl_export.json --report-id intek-2025
+
+Entries go into the time_entries table declared in lib/db.ts (created
+here too if missing). Each row's primary key is dedup.entry_hash(), so
+loading the same report twice, or a CSV and the PDF it came from, leaves
+one copy: conflicting rows are skipped, never duplicated. Sources can be
+anything input_adapters reads: extracted CSVs, Toggl CSV/JSON exports or
+report PDFs.
+
+Sources are read into batches that an asyncio queue hands to --workers
+concurrent writers, each with its own pooled connection. On Postgres
+(asyncpg) a batch is COPYed into a temporary table and moved over with
+INSERT ... ON CONFLICT DO NOTHING, or sent as one multi-row INSERT with
+--mode values. The SQLite stand-in runs the same statements through
+sqlite3 in a thread, for trying the loader without a server.
+"""
+import argparse
+import asyncio
+import glob
+import os
+import sqlite3
+import time
+
+import input_adapters
+from dedup import entry_hash
+
+BATCH_SIZE = 2000
+# Postgres takes at most this many bind parameters per statement (--mode values)
+MAX_PARAMETERS = 32767
+COLUMNS = ('entry_hash', 'report_id', 'description', 'duration_seconds', 'member', 'project',
+           'entry_date', 'start_time', 'end_time', 'tags', 'source')
+# Same table as lib/db.ts initializeDatabase()
+SCHEMA = (
+    '''CREATE TABLE IF NOT EXISTS time_entries (
+        entry_hash VARCHAR(64) PRIMARY KEY,
+        report_id VARCHAR(255),
+        description TEXT NOT NULL,
+        duration_seconds INTEGER NOT NULL,
+        member VARCHAR(255),
+        project VARCHAR(255),
+        entry_date VARCHAR(50),
+        start_time VARCHAR(10),
+        end_time VARCHAR(10),
+        tags TEXT,
+        source VARCHAR(500),
+        created_on TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )''',
+    'CREATE INDEX IF NOT EXISTS idx_time_entries_member_date ON time_entries(member, entry_date)',
+    'CREATE INDEX IF NOT EXISTS idx_time_entries_report_id ON time_entries(report_id)',
+)
+
+
+def entry_record(entry, report_id, source):
+    key = entry_hash(entry.member, entry.date, entry.start_time, entry.end_time, entry.seconds, entry.description)
+    return (key, report_id, entry.description, entry.seconds, entry.member, entry.project, entry.date,
+            entry.start_time, entry.end_time, entry.tags, source)
+
+
+def batches(paths, report_id, batch_size=BATCH_SIZE):
+    """(source, [records]) batches over every source in turn."""
+    for path in paths:
+        source = os.path.basename(path)
+        batch = []
+        # A Toggl export saved next to a PDF is read instead of parsing the PDF
+        fmt, resolved = input_adapters.resolve(path)
+        for entry in input_adapters.read_entries(resolved, fmt):
+            batch.append(entry_record(entry, report_id, source))
+            if len(batch) >= batch_size:
+                yield source, batch
+                batch = []
+        if batch:
+            yield source, batch
+
+
+class PostgresStore:
+    """asyncpg connection pool writing batches with COPY or multi-row INSERT."""
+
+    def __init__(self, dsn, workers, mode='copy'):
+        self.dsn = dsn
+        self.workers = workers
+        self.mode = mode
+        self.pool = None
+
+    async def open(self):
+        try:
+            import asyncpg
+        except ImportError:
+            raise SystemExit('Postgres loading needs asyncpg: pip install asyncpg (or use --sqlite)')
+        self.pool = await asyncpg.create_pool(self.dsn, min_size=1, max_size=self.workers)
+        async with self.pool.acquire() as connection:
+            for statement in SCHEMA:
+                await connection.execute(statement)
+
+    async def insert(self, records):
+        """Insert records, skipping hashes already present; returns the rows added."""
+        columns = ', '.join(COLUMNS)
+        async with self.pool.acquire() as connection:
+            async with connection.transaction():
+                if self.mode == 'copy':
+                    await connection.execute(
+                        'CREATE TEMP TABLE time_entries_batch (LIKE time_entries INCLUDING DEFAULTS) ON COMMIT DROP')
+                    await connection.copy_records_to_table('time_entries_batch', records=records, columns=COLUMNS)
+                    status = await connection.execute(
+                        f'INSERT INTO time_entries ({columns}) SELECT {columns} FROM time_entries_batch '
+                        'ON CONFLICT (entry_hash) DO NOTHING')
+                else:
+                    width = len(COLUMNS)
+                    rows = ', '.join(
+                        '(' + ', '.join(f'${row * width + column + 1}' for column in range(width)) + ')'
+                        for row in range(len(records)))
+                    values = [value for record in records for value in record]
+                    status = await connection.execute(
+                        f'INSERT INTO time_entries ({columns}) VALUES {rows} ON CONFLICT (entry_hash) DO NOTHING',
+                        *values)
+        # 'INSERT 0 <rows>'
+        return int(status.split()[-1])
+
+    async def count(self):
+        async with self.pool.acquire() as connection:
+            return await connection.fetchval('SELECT COUNT(*) FROM time_entries')
+
+    async def close(self):
+        await self.pool.close()
+
+
+class SQLiteStore:
+    """sqlite3 stand-in with the same schema; statements run in a worker thread.
+
+    SQLite has a single writer, so batches are serialized on one connection.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = None
+        self.lock = asyncio.Lock()
+
+    def _open(self):
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        for statement in SCHEMA:
+            self.connection.execute(statement)
+        self.connection.commit()
+
+    def _insert(self, records):
+        placeholders = ', '.join('?' * len(COLUMNS))
+        with self.connection:
+            before = self.connection.total_changes
+            self.connection.executemany(
+                f'INSERT INTO time_entries ({", ".join(COLUMNS)}) VALUES ({placeholders}) '
+                'ON CONFLICT (entry_hash) DO NOTHING', records)
+            return self.connection.total_changes - before
+
+    async def open(self):
+        await asyncio.to_thread(self._open)
+
+    async def insert(self, records):
+        async with self.lock:
+            return await asyncio.to_thread(self._insert, records)
+
+    async def count(self):
+        async with self.lock:
+            return await asyncio.to_thread(
+                lambda: self.connection.execute('SELECT COUNT(*) FROM time_entries').fetchone()[0])
+
+    async def close(self):
+        await asyncio.to_thread(self.connection.close)
+
+
+async def load(store, paths, report_id=None, workers=4, batch_size=BATCH_SIZE):
+    """Stream every source into store; returns {source: {'entries', 'inserted'}}.
+
+    If a writer fails (a bad row, a lost connection) the producer and the
+    other writers are cancelled and its error is raised.
+    """
+    queue = asyncio.Queue(maxsize=workers * 2)
+    totals = {os.path.basename(path): {'entries': 0, 'inserted': 0} for path in paths}
+
+    async def writer():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            source, records = item
+            inserted = await store.insert(records)
+            totals[source]['entries'] += len(records)
+            totals[source]['inserted'] += inserted
+
+    async def producer():
+        # Parsing is CPU-bound: produce batches in a thread so the writers keep going
+        loop = asyncio.get_running_loop()
+        iterator = batches(paths, report_id, batch_size)
+        done = object()
+        while True:
+            item = await loop.run_in_executor(None, next, iterator, done)
+            if item is done:
+                break
+            await queue.put(item)
+        for _ in range(workers):
+            await queue.put(None)
+
+    tasks = [asyncio.create_task(producer())] + [asyncio.create_task(writer()) for _ in range(workers)]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    return totals
+
+
+def expand(patterns):
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(glob.glob(os.path.join(pattern, '*.csv')))
+        else:
+            matches = sorted(glob.glob(pattern)) or [pattern]
+        paths.extend(path for path in matches if path not in paths)
+    return paths
+
+
+async def run(args):
+    paths = expand(args.sources)
+    if args.sqlite:
+        store = SQLiteStore(args.sqlite)
+    else:
+        dsn = args.dsn or os.environ.get('POSTGRES_URL') or os.environ.get('DATABASE_URL')
+        if not dsn:
+            print("⚠️  POSTGRES_URL or DATABASE_URL is not set (or pass --dsn, or --sqlite PATH)")
+            return 1
+        store = PostgresStore(dsn, args.workers, args.mode)
+        if args.mode == 'values' and args.batch_size > MAX_PARAMETERS // len(COLUMNS):
+            args.batch_size = MAX_PARAMETERS // len(COLUMNS)
+            print(f"--mode values sends every value as a parameter; batches capped at {args.batch_size} entries")
+
+    await store.open()
+    start = time.perf_counter()
+    try:
+        totals = await load(store, paths, args.report_id, args.workers, args.batch_size)
+        rows = await store.count()
+    finally:
+        await store.close()
+    elapsed = time.perf_counter() - start
+
+    for source, total in totals.items():
+        skipped = total['entries'] - total['inserted']
+        print(f"  {source}: {total['entries']} entries, {total['inserted']} inserted, {skipped} already loaded")
+    entries = sum(total['entries'] for total in totals.values())
+    inserted = sum(total['inserted'] for total in totals.values())
+    rate = entries / elapsed if elapsed else 0
+    print(f"\n✅ {inserted} of {entries} entries inserted in {elapsed:.2f}s ({rate:,.0f} entries/s); "
+          f"time_entries now has {rows} rows")
+    return 0
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Load extracted time entries into Postgres (or SQLite)')
+    arg_parser.add_argument('sources', nargs='+', help='report CSVs, Toggl exports or PDFs, globs or directories of CSVs')
+    arg_parser.add_argument('--dsn', help='Postgres URL (default: POSTGRES_URL or DATABASE_URL)')
+    arg_parser.add_argument('--sqlite', metavar='PATH', help='load into this SQLite file instead of Postgres')
+    arg_parser.add_argument('--report-id', help='reports.id the entries belong to')
+    arg_parser.add_argument('-w', '--workers', type=int, default=4, help='concurrent writers / pooled connections')
+    arg_parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='entries per insert')
+    arg_parser.add_argument('--mode', choices=['copy', 'values'], default='copy',
+                            help='Postgres insert method: COPY via a temp table, or one multi-row INSERT')
+    args = arg_parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
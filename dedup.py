@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""Merge several versions of a report without double-counting.
+
+    python dedup.py 'reportes_csv/intek*.csv'
+    python dedup.py old.csv new.csv -o merged.csv --conflicts conflicts.json
+    python dedup.py reportes_csv/penguin_v2_data.csv        # overlaps inside one report
+
+Every entry is hashed on (member, date, start, end, duration, normalized
+description). Entries with the same hash are exact duplicates and are
+kept once. Of the rest, entries from different reports that share
+member, project, date and time range are the same entry edited between
+versions: the one from the later report (the later argument) wins and the
+difference is reported as a conflict.
+
+Entries without a real time range (no times, the parsers' 00:01
+placeholder, or an end equal to the start) only take part in the exact
+duplicate check: they have no slot and are left out of the overlap sweep.
+
+Overlaps are found per member with a sorted sweep over the time
+intervals, keeping the entries still open in a heap ordered by end time,
+so the whole merge is O(n log n) plus the overlaps found. An overlap
+between two reports drops the earlier report's entry (unless
+--keep-overlaps); an overlap inside one report is only reported.
+"""
+import argparse
+import csv
+import functools
+import hashlib
+import heapq
+import json
+import re
+import unicodedata
+
+import entry_output
+import report_stats
+from time_entry import TimeEntry, date_ordinal
+
+MINUTES_PER_DAY = 24 * 60
+# What the parsers write when a report has no start or end time
+PLACEHOLDER_TIME = '00:01'
+BULLETS_RE = re.compile(r'[•·]|^\s*-\s+')
+SPACES_RE = re.compile(r'\s+')
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def normalize_description(text):
+    """Lowercase, accents and bullets removed, whitespace collapsed."""
+    text = BULLETS_RE.sub(' ', text or '')
+    if not text.isascii():
+        text = ''.join(char for char in unicodedata.normalize('NFKD', text) if not unicodedata.combining(char))
+    return SPACES_RE.sub(' ', text).strip().casefold()
+
+
+def entry_hash(member, date, start_time, end_time, seconds, description):
+    """Identity of an entry: equal for exact duplicates, whatever report they came from."""
+    identity = '\x1f'.join((member, date, start_time, end_time, str(seconds), normalize_description(description)))
+    return hashlib.blake2b(identity.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _minutes(time_text):
+    if time_text == PLACEHOLDER_TIME:
+        return None
+    try:
+        hours, minutes = time_text.split(':')[:2]
+        return int(hours) * 60 + int(minutes)
+    except (AttributeError, ValueError):
+        return None
+
+
+class Entry:
+    """One CSV row with its source report, hash and time interval in minutes.
+
+    slot, start and end are None when the row has no real time range.
+    """
+
+    __slots__ = ('row', 'source', 'line', 'seconds', 'key', 'slot', 'start', 'end')
+
+    def __init__(self, row, source, line):
+        self.row = row
+        self.source = source
+        self.line = line
+        self.seconds = report_stats.duration_seconds(row['Duration (HH:MM:SS)'])
+        member, date = row['Member'], row['Date']
+        start_time, end_time = row['Start Time'], row['End Time']
+        self.key = entry_hash(member, date, start_time, end_time, self.seconds, row['Description'])
+
+        days = entry_output.date_days(date)
+        start, end = _minutes(start_time), _minutes(end_time)
+        self.slot = self.start = self.end = None
+        if days is not None and start is not None and end is not None and end != start:
+            self.slot = (member, row['Project'], date, start_time, end_time)
+            self.start = days * MINUTES_PER_DAY + start
+            # An end before the start ran past midnight
+            self.end = days * MINUTES_PER_DAY + end + (MINUTES_PER_DAY if end < start else 0)
+
+    def describe(self):
+        return {'report': self.source, 'line': self.line, 'row': self.row}
+
+    def as_entry(self):
+        row = self.row
+        return TimeEntry(row['Description'], self.seconds, row['Member'], row['Project'], date_ordinal(row['Date']),
+                         row['Start Time'], row['End Time'], row.get('Tags', ''))
+
+
+def read_entries(paths):
+    """Entries of every report, in argument order; row numbers are CSV lines."""
+    entries = []
+    for source, path in enumerate(paths):
+        with entry_output.read_text(path) as f:
+            for line, row in enumerate(csv.DictReader(f), start=2):
+                entries.append(Entry(row, source, line))
+    return entries
+
+
+def overlaps(entries):
+    """(earlier, later) pairs of one member's entries whose intervals intersect.
+
+    Entries are swept in start order per member; the heap holds the ones
+    still open, so each entry is only compared against those.
+    """
+    by_member = {}
+    for entry in entries:
+        if entry.start is not None and entry.end > entry.start:
+            by_member.setdefault(entry.row['Member'], []).append(entry)
+    pairs = []
+    for member_entries in by_member.values():
+        member_entries.sort(key=lambda entry: (entry.start, entry.end))
+        open_entries = []
+        for index, entry in enumerate(member_entries):
+            while open_entries and open_entries[0][0] <= entry.start:
+                heapq.heappop(open_entries)
+            for _, _, other in open_entries:
+                pairs.append((other, entry))
+            heapq.heappush(open_entries, (entry.end, index, entry))
+    return pairs
+
+
+def merge(entries, keep_overlaps=False):
+    """(kept entries, report) for entries from one or more report versions.
+
+    Later sources win. The report lists exact duplicates, same-slot edits
+    between reports and overlapping entries.
+    """
+    report = {'duplicates': [], 'changed': [], 'overlaps': []}
+
+    # Exact duplicates: keep the copy from the latest report
+    by_key = {}
+    for entry in entries:
+        kept = by_key.get(entry.key)
+        if kept is None:
+            by_key[entry.key] = entry
+            continue
+        winner, loser = (entry, kept) if entry.source >= kept.source else (kept, entry)
+        by_key[entry.key] = winner
+        report['duplicates'].append({'kept': winner.describe(), 'dropped': loser.describe(),
+                                     'same_report': winner.source == loser.source})
+    unique = list(by_key.values())
+
+    # Same member, project, date and times in different reports: an edited entry
+    by_slot = {}
+    kept = []
+    for entry in sorted(unique, key=lambda entry: entry.source, reverse=True):
+        if entry.slot is None:
+            kept.append(entry)
+            continue
+        winner = by_slot.get(entry.slot)
+        if winner is None or winner.source == entry.source:
+            by_slot.setdefault(entry.slot, entry)
+            kept.append(entry)
+            continue
+        fields = [name for name in entry.row if entry.row[name] != winner.row.get(name)]
+        report['changed'].append({'kept': winner.describe(), 'dropped': entry.describe(), 'fields': fields})
+
+    dropped = set()
+    for earlier, later in overlaps(kept):
+        if earlier.slot == later.slot and earlier.source == later.source:
+            kind = 'repeated slot'
+        else:
+            kind = 'overlap'
+        same_report = earlier.source == later.source
+        record = {'kind': kind, 'same_report': same_report, 'a': earlier.describe(), 'b': later.describe(),
+                  'minutes': min(earlier.end, later.end) - max(earlier.start, later.start)}
+        if not same_report and not keep_overlaps:
+            loser = earlier if earlier.source < later.source else later
+            if id(loser) not in dropped:
+                dropped.add(id(loser))
+                record['dropped'] = 'a' if loser is earlier else 'b'
+        report['overlaps'].append(record)
+
+    kept = [entry for entry in kept if id(entry) not in dropped]
+    # Back in report order: sources first to last, each in file order
+    kept.sort(key=lambda entry: (entry.source, entry.line))
+    return kept, report
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Merge report versions, dropping duplicates and reporting overlaps')
+    arg_parser.add_argument('csvs', nargs='+', help='report CSVs (or globs), oldest first: later reports win')
+    arg_parser.add_argument('-o', '--output', help='write the merged entries (.csv, .csv.gz, .parquet, ...)')
+    arg_parser.add_argument('--conflicts', metavar='PATH', help='write duplicates, edits and overlaps as JSON')
+    arg_parser.add_argument('--keep-overlaps', action='store_true',
+                            help='keep both entries when reports overlap instead of the later one only')
+    arg_parser.add_argument('--show', type=int, default=5, help='conflicts of each kind to print')
+    args = arg_parser.parse_args()
+
+    import glob
+
+    paths = []
+    for pattern in args.csvs:
+        matches = sorted(glob.glob(pattern)) or [pattern]
+        paths.extend(path for path in matches if path not in paths)
+
+    entries = read_entries(paths)
+    kept, report = merge(entries, args.keep_overlaps)
+    report['reports'] = paths
+
+    for source, path in enumerate(paths):
+        rows = [entry for entry in entries if entry.source == source]
+        print(f"  [{source}] {path}: {len(rows)} entries, "
+              f"{report_stats.format_duration(sum(entry.seconds for entry in rows), pad_hours=False)}")
+    within = sum(1 for duplicate in report['duplicates'] if duplicate['same_report'])
+    print(f"\nExact duplicates: {len(report['duplicates'])} ({within} within one report)")
+    print(f"Edited between reports (same member/project/date/times): {len(report['changed'])}")
+    for change in report['changed'][:args.show]:
+        kept_row, dropped_row = change['kept']['row'], change['dropped']['row']
+        print(f"   - {kept_row['Member']} {kept_row['Date']} {kept_row['Start Time']}-{kept_row['End Time']}: "
+              + ', '.join(f"{field} {dropped_row[field]!r} -> {kept_row[field]!r}" for field in change['fields']))
+    dropped = sum(1 for overlap in report['overlaps'] if 'dropped' in overlap)
+    print(f"Overlapping entries: {len(report['overlaps'])} ({dropped} resolved by dropping the earlier report's entry)")
+    for overlap in report['overlaps'][:args.show]:
+        a, b = overlap['a'], overlap['b']
+        print(f"   - {a['row']['Member']} {a['row']['Date']}: [{a['report']}] line {a['line']} "
+              f"{a['row']['Start Time']}-{a['row']['End Time']} / [{b['report']}] line {b['line']} "
+              f"{b['row']['Start Time']}-{b['row']['End Time']} ({overlap['minutes']} min)")
+
+    total = sum(entry.seconds for entry in kept)
+    print(f"\n✅ Merged: {len(kept)} of {len(entries)} entries, {report_stats.format_duration(total, pad_hours=False)}")
+    if args.output:
+        import extract_intek_final
+
+        extract_intek_final.write_entries((entry.as_entry() for entry in kept), args.output)
+        print(f"✅ Saved to {args.output}")
+    if args.conflicts:
+        with open(args.conflicts, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"✅ Conflicts saved to {args.conflicts}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
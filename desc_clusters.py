@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Group near-duplicate task descriptions for the per-task totals.
+
+    python desc_clusters.py reportes_csv/intek_medical_final_data.csv
+    python desc_clusters.py 'reportes_csv/*.csv' --threshold 0.7 --show 20
+
+Descriptions are first normalized (accents, bullets, punctuation, case
+and whitespace; see cluster_key), which already merges "Actualización WP"
+and "actualizacion - WP". Near-duplicates beyond that are matched on the
+Jaccard similarity of their character trigrams, blocked by trigram
+prefixes: two descriptions can only reach the threshold if they share
+one of the few rarest trigrams of each (see prefix_length), so each
+description is only compared against those sharing such a block instead
+of against every other one, and no pair above the threshold is missed.
+Matches must also mention the same numbers (P0001 and P0002 are
+different projects however similar the rest reads).
+"""
+import argparse
+import math
+import re
+from collections import Counter, deque
+
+from dedup import normalize_description
+
+THRESHOLD = 0.85
+NUMBER_RE = re.compile(r'\d+')
+PUNCTUATION_RE = re.compile(r'[^\w\s]+')
+SPACES_RE = re.compile(r'\s+')
+
+
+def cluster_key(text):
+    """normalize_description() with punctuation dropped too ("Ajustes - Wifi" == "Ajustes Wifi")."""
+    return SPACES_RE.sub(' ', PUNCTUATION_RE.sub(' ', normalize_description(text))).strip()
+
+
+def shingles(text):
+    """Character trigrams of a cluster_key()."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def prefix_length(size, threshold):
+    """Trigrams, rarest first, two sets at >= threshold Jaccard must share one of."""
+    return size - math.ceil(threshold * size - 1e-9) + 1
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+class _Clusters:
+    """Union-find over description indices."""
+
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, index):
+        parent = self.parent
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            self.parent[max(a, b)] = min(a, b)
+
+
+def cluster(descriptions, threshold=THRESHOLD):
+    """Cluster id (the index of its first member) for each description."""
+    normalized = [cluster_key(text) for text in descriptions]
+    clusters = _Clusters(len(descriptions))
+
+    # Identical after normalization: no need to hash them twice
+    first = {}
+    distinct = []
+    for index, text in enumerate(normalized):
+        seen = first.setdefault(text, index)
+        if seen == index:
+            distinct.append(index)
+        else:
+            clusters.union(seen, index)
+
+    if threshold < 1:
+        sets = {index: shingles(normalized[index]) for index in distinct}
+        numbers = {index: NUMBER_RE.findall(normalized[index]) for index in distinct}
+        frequency = Counter(gram for grams in sets.values() for gram in grams)
+        # Smallest sets first, so every candidate found in the index is no larger
+        blocks = {}
+        for index in sorted(distinct, key=lambda index: len(sets[index])):
+            grams = sets[index]
+            size = len(grams)
+            prefix = sorted(grams, key=lambda gram: (frequency[gram], gram))[:prefix_length(size, threshold)]
+            smallest = threshold * size
+            candidates = set()
+            for gram in prefix:
+                block = blocks.get(gram)
+                if block is None:
+                    block = blocks[gram] = deque()
+                # Sizes only grow from here on, so sets too small to match now never will
+                while block and len(sets[block[0]]) < smallest:
+                    block.popleft()
+                candidates.update(block)
+                block.append(index)
+            for other in candidates:
+                if (numbers[other] == numbers[index] and clusters.find(other) != clusters.find(index)
+                        and jaccard(sets[other], grams) >= threshold):
+                    clusters.union(other, index)
+
+    return [clusters.find(index) for index in range(len(descriptions))]
+
+
+def cluster_totals(description_totals, threshold=THRESHOLD):
+    """report_stats description totals -> [(label, entries, seconds, variants)].
+
+    The label is the variant carrying the most time; variants lists every
+    description folded into the cluster.
+    """
+    ids = cluster([desc for desc, _, _ in description_totals], threshold)
+    grouped = {}
+    for cluster_id, (desc, count, seconds) in zip(ids, description_totals):
+        grouped.setdefault(cluster_id, []).append((desc, count, seconds))
+    totals = []
+    for variants in grouped.values():
+        label = max(variants, key=lambda variant: variant[2])[0]
+        totals.append((label, sum(count for _, count, _ in variants), sum(seconds for _, _, seconds in variants),
+                       [desc for desc, _, _ in variants]))
+    return totals
+
+
+def main():
+    import glob
+    import time
+
+    import query_csv
+    import report_stats
+
+    arg_parser = argparse.ArgumentParser(description='Cluster near-duplicate task descriptions across report CSVs')
+    arg_parser.add_argument('csvs', nargs='+', help='report CSVs or globs')
+    arg_parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                            help='trigram Jaccard similarity needed to merge (1 = normalization only)')
+    arg_parser.add_argument('--show', type=int, default=10, help='clusters to print, largest first')
+    args = arg_parser.parse_args()
+
+    totals = {}
+    for pattern in args.csvs:
+        for path in sorted(glob.glob(pattern)) or [pattern]:
+            report, _ = query_csv.load_report(path)
+            for desc, (count, seconds) in query_csv.query([report], by='description').items():
+                total = totals.setdefault(desc, [0, 0])
+                total[0] += count
+                total[1] += seconds
+
+    start = time.perf_counter()
+    clustered = cluster_totals([(desc, count, seconds) for desc, (count, seconds) in totals.items()], args.threshold)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    for label, count, seconds, variants in sorted(clustered, key=lambda item: item[2], reverse=True)[:args.show]:
+        print(f"  - \"{label[:60]}\": {count} entries, {report_stats.format_duration(seconds, pad_hours=False)}")
+        for variant in variants:
+            if variant != label:
+                print(f"      + \"{variant[:60]}\"")
+    print(f"\n✅ {len(totals)} descriptions -> {len(clustered)} tasks ({elapsed:.1f} ms)")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""Why a report's entries don't add up: every duration line, classified once.
+
+    python diagnostics.py --pdf reportes_csv/intek-medical-final.pdf
+    python diagnostics.py --pdf 'reportes_csv/intek medical.pdf' --json diagnostics.json
+
+Each line carrying an H:MM:SS duration gets exactly one kind:
+
+    captured          toggl_parser built an entry from it
+    header_total      the grand total under "Total Hours"
+    subtotal          a "Total" / "Billable" line
+    member_same_line  names a member but produced no entry
+    member_nearby     a member within NEARBY lines, but no entry
+    orphan            no member anywhere near it
+    garbled           a member line whose duration is interleaved with
+                      description text (found by the parser's reconciliation)
+
+Member lines are indexed by line number up front and the parser's entries
+are keyed by the line they came from, so classifying a line is a few set
+lookups and the whole report is linear in its size. --json writes every
+classified line with its page, line on the page and surrounding lines.
+"""
+import argparse
+import json
+
+import pdf_lines
+import report_stats
+import toggl_parser
+from roster import default_roster
+
+NEARBY = 2
+KINDS = ('captured', 'header_total', 'subtotal', 'member_same_line', 'member_nearby', 'orphan', 'garbled')
+MISSED = ('member_same_line', 'member_nearby', 'garbled')
+
+
+def _clean(text):
+    return text.replace('\x00', ' ').strip() if text else ''
+
+
+def analyze(pages, roster=None, nearby=NEARBY):
+    """Classify every duration line of extracted pages; returns the report dict.
+
+    {'lines': [{'line', 'page', 'page_line', 'kind', 'seconds', 'member',
+    'project', 'text', 'entry', 'context'}], 'kinds': {kind: {'lines', 'seconds'}},
+    'spurious', 'header_total', 'captured_total', 'delta', 'explained'}
+
+    entry tells whether the parser built an entry from the line; spurious
+    lists the lines it did that for although they are not entries.
+    """
+    roster = roster or default_roster()
+    lines = [_clean(line) for line in pdf_lines.flatten(pages)]
+    starts = pdf_lines.page_starts(pages)
+
+    reconciliation = toggl_parser.new_reconciliation()
+    entries = dict(toggl_parser.iter_indexed_entries(lines, reconciliation, roster))
+    garbled = {c['line']: c['seconds'] for c in reconciliation['unmatched'] if c['kind'] == 'garbled'}
+    # One roster scan per line finds both its member and its project
+    members = {}
+    projects = {}
+    for index, text in enumerate(lines):
+        member, project = roster.scan(text)
+        if member:
+            members[index] = member
+        if project:
+            projects[index] = project
+
+    records = []
+    header_total = None
+    for index, text in enumerate(lines):
+        match = toggl_parser.DURATION_RE.search(text) if ':' in text else None
+        if match is None and index not in garbled:
+            continue
+        if match is None:
+            kind, seconds = 'garbled', garbled[index]
+        else:
+            seconds = report_stats.hms_seconds(*match.groups())
+            if header_total is None and match.start() == 0 and index and lines[index - 1].startswith('Total Hours'):
+                kind = 'header_total'
+                header_total = seconds
+            elif index in entries:
+                kind = 'captured'
+            elif 'Total' in text or 'Billable' in text:
+                kind = 'subtotal'
+            elif index in members:
+                kind = 'member_same_line'
+            elif any(other in members for other in range(index - nearby, index + nearby + 1)):
+                kind = 'member_nearby'
+            else:
+                kind = 'orphan'
+        page, page_line = pdf_lines.locate(index, starts)
+        member = members.get(index)
+        if member is None and kind != 'orphan':
+            member = next((members[other] for other in range(index - nearby, index + nearby + 1) if other in members), None)
+        project = next((projects[other] for other in range(index - nearby, index + nearby + 1) if other in projects), None)
+        records.append({
+            'line': index, 'page': page, 'page_line': page_line, 'kind': kind, 'seconds': seconds,
+            'member': member, 'project': project, 'text': text, 'entry': index in entries,
+            'context': {other: lines[other] for other in range(max(0, index - nearby), min(len(lines), index + nearby + 1))},
+        })
+
+    kinds = {kind: {'lines': 0, 'seconds': 0} for kind in KINDS}
+    for record in records:
+        kinds[record['kind']]['lines'] += 1
+        kinds[record['kind']]['seconds'] += record['seconds']
+    # Entries the parser built from lines that aren't entries (a header total) inflate its total
+    spurious = [record for record in records if record['entry'] and record['kind'] != 'captured']
+    captured_total = reconciliation['entries_total']
+    delta = header_total - captured_total if header_total is not None else None
+    missed = sum(kinds[kind]['seconds'] for kind in MISSED) - sum(record['seconds'] for record in spurious)
+    return {
+        'lines': records,
+        'kinds': kinds,
+        'spurious': [record['line'] for record in spurious],
+        'header_total': header_total,
+        'captured_total': captured_total,
+        'delta': delta,
+        'explained': delta is not None and delta == missed,
+    }
+
+
+def print_lines(records, show, with_context=True):
+    for record in records[:show]:
+        print(f"  - page {record['page']} line {record['page_line']} [{record['kind']}] "
+              f"{report_stats.format_duration(record['seconds'], pad_hours=False)} {record['text'][:80]}")
+        if with_context:
+            for index, text in record['context'].items():
+                marker = '>' if index == record['line'] else ' '
+                print(f"      {marker} {index}: {text[:80]}")
+
+
+def print_report(report):
+    print(f"Duration lines: {len(report['lines'])}")
+    if not report['lines']:
+        print("⚠️  No H:MM:SS durations in the extracted text (fonts without ':' glyphs?); "
+              "try extract_intek_final.py --engine raw or --engine layout")
+    for kind, total in report['kinds'].items():
+        if total['lines']:
+            print(f"  {kind:<17} {total['lines']:>6}  {report_stats.format_duration(total['seconds'], pad_hours=False):>10}")
+    spurious = set(report['spurious'])
+    for record in report['lines']:
+        if record['line'] in spurious:
+            print(f"⚠️  page {record['page']} line {record['page_line']} is the {record['kind'].replace('_', ' ')} "
+                  f"but was also parsed as an entry: {record['text'][:60]}")
+    expected = report['header_total']
+    if expected is None:
+        print("\n⚠️  Report header total not found")
+        return
+    delta = report['delta']
+    mark = '✅' if delta == 0 or report['explained'] else '⚠️ '
+    explained = ''
+    if report['explained'] and delta:
+        explained = ', explained by the missed and spurious lines' if spurious else ', explained by the missed lines'
+    print(f"\n{mark} Header total {report_stats.format_duration(expected, pad_hours=False)}, captured "
+          f"{report_stats.format_duration(report['captured_total'], pad_hours=False)}, difference "
+          f"{delta} seconds{explained}")
+
+
+def load_report(pdf_path, roster=None):
+    pages, _ = pdf_lines.cached_extract(pdf_path)
+    return analyze(pages, roster)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Classify every duration line of a report and explain the total')
+    arg_parser.add_argument('--pdf', default='reportes_csv/intek-medical-final.pdf', help='report to inspect')
+    arg_parser.add_argument('--json', metavar='PATH', help='write every classified line (with page context) as JSON')
+    arg_parser.add_argument('--show', type=int, default=10, help='missed lines to print with their context')
+    args = arg_parser.parse_args()
+
+    report = load_report(args.pdf)
+    print_report(report)
+    missed = [record for record in report['lines'] if record['kind'] in MISSED]
+    if missed:
+        print(f"\nMissed duration lines ({len(missed)}):")
+        print_lines(missed, args.show)
+    if args.json:
+        report['pdf'] = args.pdf
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n✅ Report saved to {args.json}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Output formats for extracted time entries, chosen by file extension.
+
+    .csv              plain CSV (the dashboard's import format)
+    .csv.gz           gzip-compressed CSV
+    .csv.zst          zstd-compressed CSV (needs zstandard)
+    .parquet          Parquet (needs pyarrow)
+    .arrow, .feather  Arrow IPC file (needs pyarrow)
+
+The CSV variants carry the same rows as the plain CSV. The columnar
+formats store typed columns instead: integer seconds, a date32 date and
+dictionary-encoded member and project, so loading many reports back
+skips all string parsing.
+"""
+import datetime
+import gzip
+from array import array
+
+import time_entry
+
+FORMATS = {
+    '.csv': 'csv',
+    '.csv.gz': 'csv.gz',
+    '.csv.zst': 'csv.zst',
+    '.parquet': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+}
+COLUMNAR_FORMATS = ('parquet', 'arrow')
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+def output_format(path):
+    """Format name for path's extension, or ValueError if it has none we write."""
+    lower = path.lower()
+    for suffix, name in sorted(FORMATS.items(), key=lambda item: len(item[0]), reverse=True):
+        if lower.endswith(suffix):
+            return name
+    raise ValueError(f"Unsupported output extension for {path} (use one of {', '.join(FORMATS)})")
+
+
+def open_text(path, line_buffered=False):
+    """Open path for writing CSV text, compressing according to its extension.
+
+    line_buffered only applies to plain CSV; flushing compressed output
+    every row would defeat the compression.
+    """
+    fmt = output_format(path)
+    if fmt == 'csv.gz':
+        return gzip.open(path, 'wt', newline='', encoding='utf-8')
+    if fmt == 'csv.zst':
+        try:
+            import zstandard
+        except ImportError:
+            raise SystemExit('zstd output needs zstandard: pip install zstandard')
+        return zstandard.open(path, 'wt', newline='', encoding='utf-8')
+    return open(path, 'w', newline='', encoding='utf-8', buffering=1 if line_buffered else -1)
+
+
+def read_text(path):
+    """Open a (possibly compressed) CSV written by open_text() for reading."""
+    fmt = output_format(path)
+    if fmt == 'csv.gz':
+        return gzip.open(path, 'rt', newline='', encoding='utf-8')
+    if fmt == 'csv.zst':
+        import zstandard
+
+        return zstandard.open(path, 'rt', newline='', encoding='utf-8')
+    return open(path, 'r', newline='', encoding='utf-8')
+
+
+def date_days(date):
+    """'YYYY-MM-DD' -> days since 1970-01-01, or None."""
+    try:
+        return datetime.date.fromisoformat(date).toordinal() - EPOCH_ORDINAL
+    except (TypeError, ValueError):
+        return None
+
+
+def _pyarrow():
+    # Imported on first use: pyarrow alone costs more than the rest of startup
+    try:
+        import pyarrow
+    except ImportError:
+        raise SystemExit('Parquet/Arrow output needs pyarrow: pip install pyarrow')
+    return pyarrow
+
+
+def _dictionary(pa, codes, values):
+    return pa.DictionaryArray.from_arrays(pa.array(codes, type=pa.int32()), pa.array(values, type=pa.string()))
+
+
+def entry_table(entries):
+    """pyarrow Table of entries with typed columns."""
+    pa = _pyarrow()
+    seconds = array('q')
+    days = []
+    member_codes = array('i')
+    project_codes = array('i')
+    members = {}
+    projects = {}
+    text = {'description': [], 'start_time': [], 'end_time': [], 'tags': []}
+    for entry in entries:
+        entry = time_entry.record(entry)
+        seconds.append(entry.seconds)
+        # date32 has no room for an invalid date's text; the CSV formats keep it
+        days.append(entry.day - EPOCH_ORDINAL if isinstance(entry.day, int) and entry.day else None)
+        member_codes.append(members.setdefault(entry.member, len(members)))
+        project_codes.append(projects.setdefault(entry.project, len(projects)))
+        text['description'].append(entry.description)
+        text['start_time'].append(entry.start_time)
+        text['end_time'].append(entry.end_time)
+        text['tags'].append(entry.tags)
+
+    return pa.table({
+        'description': pa.array(text['description'], type=pa.string()),
+        'seconds': pa.array(seconds, type=pa.int64()),
+        'member': _dictionary(pa, member_codes, list(members)),
+        'project': _dictionary(pa, project_codes, list(projects)),
+        'date': pa.array(days, type=pa.int32()).cast(pa.date32()),
+        'start_time': pa.array(text['start_time'], type=pa.string()),
+        'end_time': pa.array(text['end_time'], type=pa.string()),
+        'tags': pa.array(text['tags'], type=pa.string()),
+    })
+
+
+def write_columnar(entries, path):
+    """Write entries as Parquet or Arrow IPC (by extension); returns the row count."""
+    table = entry_table(entries)
+    if output_format(path) == 'parquet':
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, path, compression='zstd')
+    else:
+        import pyarrow.feather as feather
+
+        feather.write_feather(table, path, compression='zstd')
+    return table.num_rows
@@ -1,7 +1,24 @@
 #!/usr/bin/env python3
-import pdfplumber
+import argparse
 import csv
+import json
+import os
 import re
+import sys
+import time
+
+import desc_clusters
+import entry_output
+import incremental
+import input_adapters
+import layout_extract
+import pdf_lines
+import profiling
+import raw_extract
+import report_stats
+import time_entry
+import toggl_parser
+from roster import default_roster
 
 def clean_text(text):
     if not text:
@@ -20,7 +37,80 @@ def normalize_duration(duration):
         return f'{h:02d}:{m:02d}:00'
     return duration
 
-def parse_entries(lines):
+CSV_HEADER = ['Description', 'Duration (HH:MM:SS)', 'Member', 'Project', 'Date', 'Start Time', 'End Time', 'Tags']
+
+def entry_row(entry):
+    entry = time_entry.record(entry)
+    return [
+        entry.description,
+        report_stats.format_duration(entry.seconds),
+        entry.member,
+        entry.project,
+        entry.date,
+        entry.start_time,
+        entry.end_time,
+        entry.tags
+    ]
+
+def write_csv(entries, output_path, line_buffered=False):
+    """Write entries (any iterable) as CSV rows, returning the row count.
+
+    line_buffered flushes every row as soon as it is written, so a reader
+    tailing the file sees entries while the extraction is still running.
+    """
+    count = 0
+    with entry_output.open_text(output_path, line_buffered) as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADER)
+        for entry in entries:
+            writer.writerow(entry_row(entry))
+            count += 1
+    return count
+
+def write_entries(entries, output_path, line_buffered=False):
+    """write_csv(), or a columnar file when output_path ends in .parquet/.arrow/.feather."""
+    if entry_output.output_format(output_path) in entry_output.COLUMNAR_FORMATS:
+        return entry_output.write_columnar(entries, output_path)
+    return write_csv(entries, output_path, line_buffered)
+
+def default_output_path(report_path, output_dir=None, fmt='csv'):
+    """reportes_csv/intek-medical-final.pdf -> reportes_csv/intek_medical_final_data.csv
+
+    The CSV goes next to the report unless output_dir is given; fmt picks
+    the extension (see entry_output.FORMATS).
+    """
+    stem = os.path.basename(report_path)
+    for suffix in sorted(input_adapters.EXPORT_SUFFIXES + ('.pdf',), key=len, reverse=True):
+        if stem.lower().endswith(suffix):
+            stem = stem[:-len(suffix)]
+            break
+    stem = re.sub(r'[\s\-]+', '_', stem.strip()).lower()
+    if not stem.endswith('_data'):
+        stem += '_data'
+    directory = os.path.dirname(report_path) if output_dir is None else output_dir
+    return os.path.join(directory, f"{stem}.{fmt}")
+
+def summarize(entries):
+    summary = report_stats.EntryColumns()
+    summary.extend(entries)
+    return summary
+
+def print_summary(summary):
+    total_seconds = summary.total_seconds()
+    desc_totals = summary.description_totals()
+    # Near-duplicate spellings of a task count as one task
+    task_totals = desc_clusters.cluster_totals(desc_totals)
+    
+    print(f"\n✅ Total: {report_stats.format_duration(total_seconds)} ({total_seconds / 3600:.2f}h)")
+    print(f"✅ Members: {dict(sorted(summary.member_counts().items()))}")
+    print(f"✅ Unique descriptions: {len(desc_totals)} ({len(task_totals)} tasks after merging near-duplicates)")
+    print(f"\nTop 10 task descriptions:")
+    for desc, count, seconds, variants in sorted(task_totals, key=lambda x: x[2], reverse=True)[:10]:
+        merged = f" ({len(variants)} spellings)" if len(variants) > 1 else ''
+        print(f"  - \"{desc[:60]}\": {count} entries, {seconds / 3600:.2f}h{merged}")
+
+def parse_entries(lines, roster=None):
+    roster = roster or default_roster()
     entries = []
     i = 0
     processed_indices = set()  # Track which lines we've already processed
@@ -41,7 +131,7 @@ def parse_entries(lines):
         dur_match = re.search(r'(\d+):(\d{2}):(\d{2})', line_clean)
         if dur_match and 'Total' not in line_clean and 'Billable' not in line_clean:
             # Check if member is in same line or nearby
-            member_in_same = bool(re.search(r'\b(Alberto|Dani|Joan|Jordi)\b', line_clean))
+            member_in_same = roster.has_member(line_clean)
             member_nearby = False
             
             if not member_in_same:
@@ -49,13 +139,13 @@ def parse_entries(lines):
                 for j in range(max(0, i-3), min(len(lines), i+4)):
                     if j != i and j not in processed_indices:
                         nearby_line = clean_text(lines[j])
-                        if re.search(r'\b(Alberto|Dani|Joan|Jordi)\b', nearby_line) and 'Total' not in nearby_line:
+                        if roster.has_member(nearby_line) and 'Total' not in nearby_line:
                             member_nearby = True
                             break
             
             # Try to parse if member is found (same line or nearby)
             if member_in_same or member_nearby:
-                entry = parse_entry_from_line(lines, i)
+                entry = parse_entry_from_line(lines, i, roster)
                 if entry:
                     entries.append(entry)
                     processed_indices.add(i)
@@ -66,8 +156,9 @@ def parse_entries(lines):
     
     return entries
 
-def parse_entry_from_line(lines, start_idx):
+def parse_entry_from_line(lines, start_idx, roster=None):
     """Parse entry starting from a line with duration pattern"""
+    roster = roster or default_roster()
     if start_idx >= len(lines):
         return None
     
@@ -80,25 +171,23 @@ def parse_entry_from_line(lines, start_idx):
         return None
     
     duration = f"{dur_match.group(1)}:{dur_match.group(2)}:{dur_match.group(3)}"
+    seconds = report_stats.hms_seconds(*dur_match.groups())
     
     # Extract member - first check same line
-    member_match = re.search(r'\b(Alberto|Dani|Joan|Jordi)\b', main_line)
+    member = roster.find_member(main_line)
     
     # If not in same line, look in nearby lines
-    if not member_match:
+    if not member:
         for j in range(max(0, start_idx - 3), min(len(lines), start_idx + 4)):
             if j != start_idx:
                 nearby_line = clean_text(lines[j])
-                member_match = re.search(r'\b(Alberto|Dani|Joan|Jordi)\b', nearby_line)
-                if member_match and 'Total' not in nearby_line and 'DESCRIPTION' not in nearby_line:
+                member = roster.find_member(nearby_line)
+                if member and 'Total' not in nearby_line and 'DESCRIPTION' not in nearby_line:
                     break
     
-    if not member_match:
+    if not member:
         return None
     
-    member_name = member_match.group(1)
-    member = 'Alberto' if member_name == 'Jordi' else member_name
-    
     # Extract project (look for "Intek Medical" or other project names)
     project = 'Intek Medical'  # Default
     project_match = re.search(r'•\s*(\w+(?:\s+\w+)?)', main_line)
@@ -127,7 +216,7 @@ def parse_entry_from_line(lines, start_idx):
                     # Check if it looks like a description
                     if desc_candidate and any(c.isalpha() for c in desc_candidate) and len(desc_candidate) > 2:
                         # Don't include if it's another entry line
-                        if not (re.search(r'\d+:\d{2}:\d{2}', desc_candidate) and ('Dani' in desc_candidate or 'Alberto' in desc_candidate)):
+                        if not (re.search(r'\d+:\d{2}:\d{2}', desc_candidate) and roster.names_entry_line(desc_candidate)):
                             desc_parts.append(desc_candidate)
         
         # Check one more line back
@@ -139,7 +228,7 @@ def parse_entry_from_line(lines, start_idx):
                 desc_candidate = re.sub(r'\s*\d{2}:\d{2}\s*-\s*\d{2}:\d{2}', '', desc_candidate)
                 desc_candidate = desc_candidate.strip()
                 if desc_candidate and any(c.isalpha() for c in desc_candidate) and len(desc_candidate) > 2:
-                    if not (re.search(r'\d+:\d{2}:\d{2}', desc_candidate) and ('Dani' in desc_candidate or 'Alberto' in desc_candidate)):
+                    if not (re.search(r'\d+:\d{2}:\d{2}', desc_candidate) and roster.names_entry_line(desc_candidate)):
                         desc_parts.append(desc_candidate)
     
     # Check if description is in the same line (before duration)
@@ -147,7 +236,7 @@ def parse_entry_from_line(lines, start_idx):
         before_duration = main_line[:dur_match.start()].strip()
         if before_duration:
             # Clean up
-            before_duration = re.sub(r'\b(Dani|Alberto|Joan|Jordi)\b', '', before_duration)
+            before_duration = roster.strip_members(before_duration)
             before_duration = re.sub(r'•.*', '', before_duration)
             before_duration = re.sub(r'\s*-\s*$', '', before_duration)
             before_duration = before_duration.strip()
@@ -212,7 +301,7 @@ def parse_entry_from_line(lines, start_idx):
         # Check for project marker
         project_match = re.search(r'•\s*([^-]+?)(?:\s+\d{2}/\d{2}/\d{4})', line)
         if project_match:
-            project_found = project_match.group(1).strip()
+            project_found = roster.canonical_project(project_match.group(1).strip())
         
         # Check for date
         date_match = re.search(r'(\d{2})/(\d{2})/(\d{4})', line)
@@ -240,7 +329,7 @@ def parse_entry_from_line(lines, start_idx):
                 if '•' in line:
                     project_match = re.search(r'•\s*([^-]+?)(?:\s+\d{2}/\d{2}/\d{4})', line)
                     if project_match:
-                        project_found = project_match.group(1).strip()
+                        project_found = roster.canonical_project(project_match.group(1).strip())
                 break
     
     # If still no date found, try to find the closest date in the entire document context
@@ -264,6 +353,7 @@ def parse_entry_from_line(lines, start_idx):
     return {
         'description': description,
         'duration': duration,
+        'seconds': seconds,
         'member': member,
         'project': project_found if project_found else project,
         'date': date,
@@ -272,88 +362,297 @@ def parse_entry_from_line(lines, start_idx):
         'tags': ''
     }
 
-if __name__ == '__main__':
-    pdf_path = 'reportes_csv/intek-medical-final.pdf'
-    output_path = 'reportes_csv/intek_medical_final_data.csv'
-    
-    print(f"Extracting from {pdf_path}...")
-    with pdfplumber.open(pdf_path) as pdf:
-        text_lines = []
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text_lines.extend(page_text.split('\n'))
-    
-    print(f"Total lines extracted: {len(text_lines)}")
-    
-    entries = parse_entries(text_lines)
-    
-    print(f"\nFound {len(entries)} entries")
-    
-    # Calculate total
-    def time_to_hours(duration):
-        if not duration:
-            return 0
-        parts = duration.split(':')
-        if len(parts) == 3:
-            h, m, s = int(parts[0]), int(parts[1]), int(parts[2])
-            return h + m/60 + s/3600
-        return 0
-    
-    total_hours = sum(time_to_hours(e.get('duration', '')) for e in entries)
-    total_seconds = sum(
-        int(e.get('duration', '0:0:0').split(':')[0]) * 3600 + 
-        int(e.get('duration', '0:0:0').split(':')[1]) * 60 + 
-        int(e.get('duration', '0:0:0').split(':')[2])
-        for e in entries
-    )
-    hours = total_seconds // 3600
-    minutes = (total_seconds % 3600) // 60
-    seconds = total_seconds % 60
-    
-    # Group by description to see unique tasks
-    desc_groups = {}
-    for entry in entries:
-        desc = entry.get('description', '').strip()
-        key = desc.lower()
-        if key not in desc_groups:
-            desc_groups[key] = {'desc': desc, 'entries': [], 'total_hours': 0}
-        desc_groups[key]['entries'].append(entry)
-        desc_groups[key]['total_hours'] += time_to_hours(entry.get('duration', ''))
-    
-    # Members
-    members = {}
-    for entry in entries:
-        m = entry.get('member', '')
-        members[m] = members.get(m, 0) + 1
-    
-    print(f"\n✅ Total: {hours:02d}:{minutes:02d}:{seconds:02d} ({total_hours:.2f}h)")
-    print(f"✅ Members: {dict(sorted(members.items()))}")
-    print(f"✅ Unique descriptions: {len(desc_groups)}")
-    print(f"\nTop 10 task descriptions:")
-    for key, data in sorted(desc_groups.items(), key=lambda x: x[1]['total_hours'], reverse=True)[:10]:
-        print(f"  - \"{data['desc'][:60]}\": {len(data['entries'])} entries, {data['total_hours']:.2f}h")
-    
-    # Save CSV
-    header = ['Description', 'Duration (HH:MM:SS)', 'Member', 'Project', 'Date', 'Start Time', 'End Time', 'Tags']
-    with open(output_path, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(header)
+def print_reconciliation(reconciliation):
+    expected = reconciliation['header_total']
+    if expected is None:
+        print("\n⚠️  Report header total not found, nothing to reconcile against")
+        return
+    delta = reconciliation['delta']
+    mark = '✅' if delta == 0 else '⚠️ '
+    print(f"\n{mark} Header total: {report_stats.format_duration(expected)}, "
+          f"parsed: {report_stats.format_duration(reconciliation['entries_total'])}, "
+          f"difference: {report_stats.format_duration(abs(delta))} ({delta} seconds)")
+    if reconciliation['unmatched']:
+        explained = ' (accounts for the whole difference)' if reconciliation['explained'] else ''
+        print(f"   Unmatched duration lines{explained}:")
+        for candidate in reconciliation['unmatched']:
+            print(f"   - page {candidate['page']} line {candidate['page_line']}: "
+                  f"{report_stats.format_duration(candidate['seconds'])} [{candidate['kind']}] {candidate['text'][:70]}")
+
+def add_page_numbers(reconciliation, starts):
+    for candidate in reconciliation['unmatched']:
+        candidate['page'], candidate['page_line'] = pdf_lines.locate(candidate['line'], starts)
+
+def run_stream(pdf_path, output_path):
+    """Extract in constant memory: nothing is materialized, each resolved
+    entry is folded into the summary and written out as soon as it exists."""
+    stream_start = time.perf_counter()
+    summary = report_stats.EntryColumns()
+    reconciliation = toggl_parser.new_reconciliation()
+    starts = []
+
+    def tracked(entries):
         for entry in entries:
-            normalized_duration = normalize_duration(entry.get('duration', ''))
-            writer.writerow([
-                entry.get('description', ''),
-                normalized_duration,
-                entry.get('member', ''),
-                entry.get('project', ''),
-                entry.get('date', ''),
-                entry.get('start_time', ''),
-                entry.get('end_time', ''),
-                entry.get('tags', '')
-            ])
-    
-    print(f"\n✅ Saved to {output_path}")
+            summary.append(entry)
+            yield entry
+
+    def timed_pages(pages):
+        profiler = profiling.active()
+        for page in pages:
+            if profiler is not None:
+                profiler.add_page(page)
+            yield page
+
+    with profiling.stage('stream (extract+parse+write)'):
+        lines = pdf_lines.iter_lines(timed_pages(pdf_lines.iter_pages(pdf_path)), starts)
+        write_entries(tracked(toggl_parser.iter_entries(lines, reconciliation)), output_path, line_buffered=True)
+    add_page_numbers(reconciliation, starts)
+    profiling.count('entries emitted', len(summary))
+    profiling.count('duration lines dropped', len(reconciliation['unmatched']))
+    print(f"\nFound {len(summary)} entries (streamed in {time.perf_counter() - stream_start:.2f}s)")
+    print_summary(summary)
+    return reconciliation
+
+def run_layout(pdf_path, output_path):
+    """Column-bucketed extraction from word coordinates (layout_extract)."""
+    extract_start = time.perf_counter()
+    with profiling.stage('layout extract'):
+        entries, reconciliation = layout_extract.extract_entries(pdf_path)
+    print(f"\nFound {len(entries)} entries (layout engine, {time.perf_counter() - extract_start:.2f}s)")
+    profiling.count('entries emitted', len(entries))
+    
+    with profiling.stage('summarize'):
+        summary = summarize(entries)
+    print_summary(summary)
+    
+    with profiling.stage('write'):
+        write_entries(entries, output_path)
+    return reconciliation
+
+def run_raw(args, pdf_path, output_path):
+    """PDFium text stream (raw_extract), falling back on run() when it doesn't reconcile."""
+    extract_start = time.perf_counter()
+    with profiling.stage('raw extract'):
+        entries, reconciliation = raw_extract.extract_entries(pdf_path)
+    elapsed = time.perf_counter() - extract_start
+    if not raw_extract.reconciles(reconciliation):
+        expected = reconciliation['header_total']
+        reason = ('no header total' if expected is None else
+                  f"{reconciliation['delta']} seconds off the header total, {len(reconciliation['unmatched'])} unfinished entries")
+        print(f"⚠️  Raw text stream does not reconcile ({reason}); falling back to pdfplumber")
+        profiling.count('raw engine fallbacks', 1)
+        return run(args, pdf_path, output_path)
+    print(f"\nFound {len(entries)} entries (raw engine, {elapsed:.2f}s)")
+    profiling.count('entries emitted', len(entries))
+    
+    with profiling.stage('summarize'):
+        summary = summarize(entries)
+    print_summary(summary)
+    
+    with profiling.stage('write'):
+        write_entries(entries, output_path)
+    return reconciliation
+
+def run_export(export_path, fmt, output_path):
+    """Entries read straight from a Toggl CSV/JSON export (input_adapters), streamed to the writer."""
+    export_start = time.perf_counter()
+    summary = report_stats.EntryColumns()
+
+    def tracked(entries):
+        for entry in entries:
+            summary.append(entry)
+            yield entry
 
+    with profiling.stage(f'{fmt} read+write'):
+        write_entries(tracked(input_adapters.read_entries(export_path, fmt)), output_path)
+    profiling.count('entries emitted', len(summary))
+    print(f"\nFound {len(summary)} entries ({fmt} export, {time.perf_counter() - export_start:.2f}s)")
+    print_summary(summary)
 
+def print_diff(diff):
+    print(f"\nChanges against the previous CSV: {len(diff['added'])} added, "
+          f"{len(diff['removed'])} removed, {len(diff['changed'])} changed")
+    for label, rows in (('+', diff['added']), ('-', diff['removed'])):
+        for row in rows[:10]:
+            print(f"   {label} {row[4]} {row[5]}-{row[6]} {row[2]:<8} {row[1]} {row[0][:60]}")
+    for change in diff['changed'][:10]:
+        old, new = change['old'], change['new']
+        fields = [CSV_HEADER[i] for i in range(len(CSV_HEADER)) if old[i] != new[i]]
+        print(f"   ~ {new[4]} {new[5]}-{new[6]} {new[2]:<8} {', '.join(fields)}")
 
+def run_incremental(args, pdf_path, output_path):
+    """Re-extract reusing the text and entries of pages seen in earlier exports,
+    then report what changed against the CSV being replaced."""
+    cache_dir = None if args.no_cache else incremental.CACHE_DIR
+    diffable = entry_output.output_format(output_path) not in entry_output.COLUMNAR_FORMATS
+    previous = incremental.read_csv_rows(output_path) if diffable else None
+    with profiling.stage('incremental extract'):
+        entries, reconciliation, stats = incremental.extract(pdf_path, cache_dir)
+    profiling.count('pages extracted', stats['pages_extracted'])
+    profiling.count('pages reparsed', stats['pages_reparsed'])
+    profiling.count('entries emitted', len(entries))
+    add_page_numbers(reconciliation, stats['page_starts'])
+    print(f"Pages: {stats['pages']}, text extracted for {stats['pages_extracted']} "
+          f"({stats['extract_seconds']:.2f}s), entries reparsed for {stats['pages_reparsed']} "
+          f"({stats['parse_seconds'] * 1000:.1f} ms)")
+    print(f"\nFound {len(entries)} entries (incremental)")
+    
+    with profiling.stage('summarize'):
+        summary = summarize(entries)
+    print_summary(summary)
+    
+    with profiling.stage('write'):
+        write_entries(entries, output_path)
+    if previous is not None:
+        with profiling.stage('diff'):
+            diff = incremental.diff_rows(previous, [entry_row(entry) for entry in entries])
+        print_diff(diff)
+        if args.diff:
+            with open(args.diff, 'w', encoding='utf-8') as f:
+                json.dump(diff, f, indent=2, ensure_ascii=False)
+    return reconciliation
 
+def run(args, pdf_path, output_path):
+    extract_start = time.perf_counter()
+    cache_dir = None if args.no_cache else pdf_lines.CACHE_DIR
+    with profiling.stage('extract (or cache load)'):
+        pages, cache_hit = pdf_lines.cached_extract(pdf_path, args.workers, cache_dir)
+    extract_seconds = time.perf_counter() - extract_start
+    text_lines = pdf_lines.flatten(pages)
+    profiler = profiling.active()
+    if profiler is not None and not cache_hit:
+        for page in pages:
+            profiler.add_page(page)
+    profiling.count('lines scanned', len(text_lines))
+    if args.page_timings:
+        pdf_lines.print_page_timings(pages, extract_seconds)
+    
+    source = 'cache' if cache_hit else 'pdf'
+    print(f"Total lines extracted: {len(text_lines)} ({extract_seconds:.2f}s, from {source})")
+    
+    reconciliation = None
+    parse_start = time.perf_counter()
+    with profiling.stage('parse'):
+        if args.parser == 'fast':
+            reconciliation = toggl_parser.new_reconciliation()
+            entries = list(toggl_parser.iter_entries(text_lines, reconciliation))
+            add_page_numbers(reconciliation, pdf_lines.page_starts(pages))
+        else:
+            entries = parse_entries(text_lines)
+    parse_ms = (time.perf_counter() - parse_start) * 1000
+    profiling.count('entries emitted', len(entries))
+    if reconciliation is not None:
+        profiling.count('duration lines dropped', len(reconciliation['unmatched']))
+    
+    print(f"\nFound {len(entries)} entries ({args.parser} parser, {parse_ms:.1f} ms)")
+    
+    with profiling.stage('summarize'):
+        summary = summarize(entries)
+    print_summary(summary)
+    
+    with profiling.stage('write'):
+        write_entries(entries, output_path)
+    return reconciliation
+
+def start_profiler(args):
+    """Profiler for --profile/--profile-json/--cprofile, instrumenting the parsers."""
+    profiler = profiling.Profiler(args.cprofile).start()
+    profiler.instrument(toggl_parser, ['classify_line', '_is_candidate', '_assemble', '_neighbour_description',
+                                       '_description_candidate', '_inline_description'])
+    profiler.instrument(default_roster(), prefix='roster')
+    profiler.instrument(layout_extract, ['find_columns', 'page_entries', 'header_total'])
+    profiler.instrument(raw_extract, ['read_pages', 'parse_pages'])
+    # The legacy parser's regexes are inline re.search calls, so only its functions are timed
+    profiler.instrument(sys.modules[__name__], ['parse_entry_from_line'], prefix='legacy')
+    return profiler
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Extract Toggl time entries from a PDF report or Toggl export')
+    arg_parser.add_argument('--parser', choices=['legacy', 'fast'], default='fast',
+                            help='legacy: window-scanning parse_entries; fast: single-pass toggl_parser, which '
+                                 'returns the same entries in about the same time but also streams and '
+                                 'reconciles against the header total (see check_parsers.py)')
+    arg_parser.add_argument('--workers', type=int, default=1,
+                            help='processes used for page extraction (0 = one per CPU)')
+    arg_parser.add_argument('--page-timings', action='store_true',
+                            help='print per-page extraction time')
+    arg_parser.add_argument('--no-cache', action='store_true',
+                            help='always re-extract instead of using the extracted-lines cache')
+    arg_parser.add_argument('--engine', choices=['text', 'layout', 'raw'], default='text',
+                            help='text: parse extracted text lines; layout: bucket words by column position; '
+                                 'raw: PDFium text stream, falling back on text unless it matches the header total')
+    arg_parser.add_argument('--stream', action='store_true',
+                            help='page -> lines -> entries -> CSV rows in constant memory (fast parser, no cache)')
+    arg_parser.add_argument('--reconciliation', metavar='PATH',
+                            help='also write the reconciliation against the header total as JSON')
+    arg_parser.add_argument('--incremental', action='store_true',
+                            help='only extract and reparse pages that differ from earlier exports, and '
+                                 'report added/removed/changed entries against the existing CSV')
+    arg_parser.add_argument('--diff', metavar='PATH',
+                            help='with --incremental, also write the entry diff as JSON')
+    arg_parser.add_argument('--pdf', '--input', dest='pdf', default='reportes_csv/intek-medical-final.pdf',
+                            help='report to extract: a PDF, or a Toggl CSV/JSON export (or the app\'s CSV)')
+    arg_parser.add_argument('--no-exports', action='store_true',
+                            help='parse the PDF even when a Toggl export with the same name sits next to it')
+    arg_parser.add_argument('-o', '--output',
+                            help='output file: .csv, .csv.gz, .csv.zst, .parquet or .arrow '
+                                 '(default: <report>_data.csv next to the report)')
+    arg_parser.add_argument('--profile', action='store_true',
+                            help='print per-stage and per-page wall/CPU time, per-function time and counters')
+    arg_parser.add_argument('--profile-json', metavar='PATH', help='also write the profile as JSON')
+    arg_parser.add_argument('--cprofile', metavar='PATH',
+                            help='dump cProfile stats (open with snakeviz, flameprof or gprof2dot)')
+    args = arg_parser.parse_args()
+    # Combinations one of the flags would silently be ignored in
+    if args.engine != 'text' and (args.stream or args.incremental):
+        arg_parser.error(f"--engine {args.engine} can't be combined with --stream or --incremental")
+    if args.stream and args.incremental:
+        arg_parser.error("--stream and --incremental can't be combined")
+    if args.parser == 'legacy' and (args.stream or args.incremental):
+        arg_parser.error("--stream and --incremental use the fast parser; drop --parser legacy")
+    if args.diff and not args.incremental:
+        arg_parser.error("--diff needs --incremental")
+    profiler = start_profiler(args) if args.profile or args.profile_json or args.cprofile else None
+
+    output_path = args.output or default_output_path(args.pdf)
+    try:
+        fmt, pdf_path = input_adapters.resolve(args.pdf, prefer_exports=not args.no_exports)
+    except (OSError, ValueError) as error:
+        arg_parser.error(str(error))
+    # The writer truncates its output before the (streamed) input is read
+    if os.path.exists(output_path) and os.path.samefile(pdf_path, output_path):
+        arg_parser.error(f"{output_path} is the input being read; pass a different -o")
+    
+    print(f"Extracting from {pdf_path}...")
+    if pdf_path != args.pdf:
+        print(f"Using the {fmt} export instead of parsing {args.pdf} (--no-exports to parse the PDF)")
+    if fmt != 'pdf':
+        reconciliation = run_export(pdf_path, fmt, output_path)
+    elif args.engine == 'layout':
+        reconciliation = run_layout(pdf_path, output_path)
+    elif args.engine == 'raw':
+        reconciliation = run_raw(args, pdf_path, output_path)
+    elif args.stream:
+        reconciliation = run_stream(pdf_path, output_path)
+    elif args.incremental:
+        reconciliation = run_incremental(args, pdf_path, output_path)
+    else:
+        reconciliation = run(args, pdf_path, output_path)
+    
+    if reconciliation is not None:
+        print_reconciliation(reconciliation)
+        if args.reconciliation:
+            with open(args.reconciliation, 'w', encoding='utf-8') as f:
+                json.dump(reconciliation, f, indent=2, ensure_ascii=False)
+    
+    print(f"\n✅ Saved to {output_path}")
+    
+    if profiler is not None:
+        profiler.stop()
+        profiler.print_report()
+        if args.profile_json:
+            profiler.write_json(args.profile_json)
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
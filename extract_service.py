@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""Local extraction service: POST a Toggl PDF, get its entries back.
+
+    python extract_service.py                          # http://127.0.0.1:8765
+    python extract_service.py --workers 4 --max-queue 16
+    python extract_service.py --socket /tmp/extract.sock
+
+    curl --data-binary @report.pdf 'http://127.0.0.1:8765/jobs?format=csv'
+    curl http://127.0.0.1:8765/jobs/<id>               # status and page progress
+    curl -o report.csv http://127.0.0.1:8765/jobs/<id>/result
+    curl http://127.0.0.1:8765/status
+
+A pool of worker processes is started (and made to import pdfplumber and
+the parser) before the server accepts anything, so a job only pays for
+the extraction itself. Jobs wait in a bounded queue: once every worker is
+busy and max-queue jobs are waiting, new uploads get 503 with Retry-After.
+
+Results are cached by the SHA-256 of the PDF bytes (and output format)
+under .cache/service/, so re-uploading a report is answered immediately,
+and two concurrent uploads of the same PDF share one job.
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import signal
+import socketserver
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pdf_lines
+
+CACHE_DIR = os.path.join(os.path.dirname(pdf_lines.CACHE_DIR), 'service')
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+SUMMARY_VERSION = 1
+MAX_UPLOAD_BYTES = 64 * 1024 * 1024
+# Finished jobs kept around for status/result requests
+KEEP_FINISHED = 500
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'csv.gz': 'application/gzip',
+    'csv.zst': 'application/zstd',
+    'parquet': 'application/vnd.apache.parquet',
+    'arrow': 'application/vnd.apache.arrow.file',
+}
+
+_progress = None
+
+
+def _warm_worker(progress):
+    """Pool initializer: pay the heavy imports once per worker process."""
+    global _progress
+    _progress = progress
+    import pdfplumber  # noqa: F401
+
+    import extract_intek_final  # noqa: F401
+    from roster import default_roster
+
+    default_roster()
+    progress.put((None, 'ready', os.getpid(), 0))
+
+
+def _noop():
+    pass
+
+
+def convert(job_id, pdf_path, output_path):
+    """Extract, parse and write one uploaded report. Runs in a worker process."""
+    import extract_intek_final
+    import report_stats
+    import toggl_parser
+
+    start = time.perf_counter()
+    _progress.put((job_id, 'running', 0, 0))
+
+    def page_done(page, total):
+        _progress.put((job_id, 'running', page, total))
+
+    pages, _ = pdf_lines.cached_extract(pdf_path, 1, pdf_lines.CACHE_DIR, progress=page_done)
+    reconciliation = toggl_parser.new_reconciliation()
+    entries = list(toggl_parser.iter_entries(pdf_lines.flatten(pages), reconciliation))
+    extract_intek_final.add_page_numbers(reconciliation, pdf_lines.page_starts(pages))
+    # The writer picks the format from the extension, so the temp name keeps all of it (.csv.gz)
+    directory, name = os.path.split(output_path)
+    digest, fmt = name.split('.', 1)
+    tmp_path = os.path.join(directory, f"{digest}.{os.getpid()}.tmp.{fmt}")
+    try:
+        extract_intek_final.write_entries(entries, tmp_path)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+    columns = report_stats.EntryColumns()
+    columns.extend(entries)
+    return {
+        'pages': len(pages),
+        'entries': len(columns),
+        'total_seconds': columns.total_seconds(),
+        'members': dict(sorted(columns.member_counts().items())),
+        'header_total': reconciliation['header_total'],
+        'delta': reconciliation.get('delta'),
+        'unmatched': [{key: candidate[key] for key in ('page', 'page_line', 'seconds', 'kind', 'text')}
+                      for candidate in reconciliation['unmatched']],
+        'seconds': round(time.perf_counter() - start, 3),
+    }
+
+
+class ResultCache:
+    """<digest>.<format> outputs plus a <digest>.<format>.json summary each."""
+
+    def __init__(self, directory, max_bytes=CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.join(directory, 'uploads'), exist_ok=True)
+
+    def output_path(self, digest, fmt):
+        return os.path.join(self.directory, f"{digest}.{fmt}")
+
+    def upload_path(self, job_id):
+        # One file per job: a finished job deletes its own without racing a new one for the same PDF
+        return os.path.join(self.directory, 'uploads', f"{job_id}.pdf")
+
+    def get(self, digest, fmt):
+        path = self.output_path(digest, fmt)
+        if not os.path.exists(path):
+            return None
+        return pdf_lines.read_cache(f"{path}.json", SUMMARY_VERSION)
+
+    def put(self, digest, fmt, summary):
+        path = f"{self.output_path(digest, fmt)}.json"
+        # The summary goes last: it is what marks the output as complete
+        pdf_lines.write_cache(path, summary, SUMMARY_VERSION)
+        self.evict(keep=path)
+
+    def evict(self, keep=None):
+        """Drop least recently used results (output and summary together)."""
+        pdf_lines.evict(self.directory, self.max_bytes, keep, companions=lambda path: [path[:-len('.json')]])
+
+
+class ExtractionService:
+    def __init__(self, workers=None, max_queue=8, cache_dir=CACHE_DIR):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.cache = ResultCache(cache_dir)
+        self.jobs = {}
+        self.in_flight = {}
+        self.finished = []
+        self.lock = threading.Lock()
+        self.counts = {'submitted': 0, 'cache_hits': 0, 'shared': 0, 'rejected': 0, 'done': 0, 'error': 0}
+        self.started = time.time()
+        self.ready = set()
+        self._all_ready = threading.Event()
+        # Workers come from a forkserver, a clean process, rather than being
+        # forks of this threaded server
+        context = multiprocessing.get_context('forkserver')
+        self.progress = context.Queue()
+        self.pool = ProcessPoolExecutor(self.workers, mp_context=context,
+                                        initializer=_warm_worker, initargs=(self.progress,))
+        self._listener = threading.Thread(target=self._listen, daemon=True)
+        self._listener.start()
+
+    def warm(self, timeout=120):
+        """Wait until every worker has started and run its imports."""
+        start = time.perf_counter()
+        # Workers are spawned as tasks arrive, so give each one something to do
+        for future in [self.pool.submit(_noop) for _ in range(self.workers)]:
+            future.result()
+        self._all_ready.wait(timeout)
+        return len(self.ready), time.perf_counter() - start
+
+    def _listen(self):
+        while True:
+            message = self.progress.get()
+            if message is None:
+                return
+            job_id, state, page, total = message
+            if job_id is None:
+                # A worker finished its imports; page is its pid
+                self.ready.add(page)
+                if len(self.ready) >= self.workers:
+                    self._all_ready.set()
+                continue
+            with self.lock:
+                job = self.jobs.get(job_id)
+                if job is not None and job['status'] in ('queued', 'running'):
+                    if job['status'] == 'queued':
+                        job['started'] = time.time()
+                    job['status'] = state
+                    job['pages_done'], job['pages_total'] = page, total
+
+    def _pending(self):
+        return sum(1 for job in self.jobs.values() if job['status'] in ('queued', 'running'))
+
+    def submit(self, data, fmt):
+        """Queue a PDF; returns (job, http_status)."""
+        digest = hashlib.sha256(data).hexdigest()
+        now = time.time()
+        job = {'id': uuid.uuid4().hex[:16], 'sha256': digest, 'format': fmt, 'bytes': len(data),
+               'submitted': now, 'pages_done': 0, 'pages_total': None}
+        with self.lock:
+            self.counts['submitted'] += 1
+            shared = self.in_flight.get((digest, fmt))
+            if shared is not None:
+                self.counts['shared'] += 1
+                return shared, 202
+            summary = self.cache.get(digest, fmt)
+            if summary is not None:
+                self.counts['cache_hits'] += 1
+                job.update(status='done', cached=True, finished=now, result=summary,
+                           pages_done=summary['pages'], pages_total=summary['pages'])
+                self._remember(job)
+                return job, 200
+            if self._pending() >= self.workers + self.max_queue:
+                self.counts['rejected'] += 1
+                return None, 503
+            job.update(status='queued', cached=False)
+            self.jobs[job['id']] = job
+            self.in_flight[(digest, fmt)] = job
+
+        upload = self.cache.upload_path(job['id'])
+        with pdf_lines.atomic_open(upload, 'wb') as f:
+            f.write(data)
+        future = self.pool.submit(convert, job['id'], upload, self.cache.output_path(digest, fmt))
+        future.add_done_callback(lambda future: self._finish(job, future))
+        return job, 202
+
+    def _finish(self, job, future):
+        try:
+            summary = future.result()
+        except Exception as e:
+            summary = None
+            error = f"{type(e).__name__}: {e}"
+        if summary is not None:
+            self.cache.put(job['sha256'], job['format'], summary)
+        with self.lock:
+            job['finished'] = time.time()
+            if summary is not None:
+                job.update(status='done', result=summary, pages_done=summary['pages'], pages_total=summary['pages'])
+                self.counts['done'] += 1
+            else:
+                job.update(status='error', error=error)
+                self.counts['error'] += 1
+            self.in_flight.pop((job['sha256'], job['format']), None)
+            self._remember(job)
+        try:
+            os.remove(self.cache.upload_path(job['id']))
+        except FileNotFoundError:
+            pass
+
+    def _remember(self, job):
+        """Keep a finished job visible; forget the oldest beyond KEEP_FINISHED. Caller holds the lock."""
+        self.jobs[job['id']] = job
+        self.finished.append(job['id'])
+        while len(self.finished) > KEEP_FINISHED:
+            self.jobs.pop(self.finished.pop(0), None)
+
+    def job(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def status(self):
+        with self.lock:
+            queued = sum(1 for job in self.jobs.values() if job['status'] == 'queued')
+            running = sum(1 for job in self.jobs.values() if job['status'] == 'running')
+            return {
+                'workers': self.workers,
+                'queued': queued,
+                'running': running,
+                'capacity': self.workers + self.max_queue,
+                'uptime_seconds': round(time.time() - self.started, 1),
+                **self.counts,
+            }
+
+    def shutdown(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        self.progress.put(None)
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    service = None
+
+    def address_string(self):
+        # Unix socket peers have no (host, port)
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def _send_json(self, status, body, headers=()):
+        data = json.dumps(body, indent=2, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _job_body(self, job):
+        body = {key: value for key, value in job.items() if key != 'result'}
+        if job['status'] == 'done':
+            body['summary'] = job['result']
+            body['result_url'] = f"/jobs/{job['id']}/result"
+        return body
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != '/jobs':
+            return self._send_json(404, {'error': 'not found'})
+        fmt = parse_qs(url.query).get('format', ['csv'])[0]
+        if fmt not in CONTENT_TYPES:
+            return self._send_json(400, {'error': f"unknown format {fmt} (use one of {', '.join(CONTENT_TYPES)})"})
+        length = int(self.headers.get('Content-Length') or 0)
+        if length <= 0:
+            return self._send_json(400, {'error': 'send the PDF as the request body'})
+        if length > MAX_UPLOAD_BYTES:
+            return self._send_json(413, {'error': f"PDF larger than {MAX_UPLOAD_BYTES} bytes"})
+        data = self.rfile.read(length)
+        if not data.startswith(b'%PDF'):
+            return self._send_json(400, {'error': 'request body is not a PDF'})
+
+        job, status = self.service.submit(data, fmt)
+        if job is None:
+            return self._send_json(503, {'error': 'queue full, retry later'}, [('Retry-After', '5')])
+        self._send_json(status, self._job_body(job), [('Location', f"/jobs/{job['id']}")])
+
+    def do_GET(self):
+        parts = urlparse(self.path).path.strip('/').split('/')
+        if parts == ['status']:
+            return self._send_json(200, self.service.status())
+        if len(parts) < 2 or parts[0] != 'jobs':
+            return self._send_json(404, {'error': 'not found'})
+        job = self.service.job(parts[1])
+        if job is None:
+            return self._send_json(404, {'error': f"no job {parts[1]}"})
+        if len(parts) == 2:
+            return self._send_json(200, self._job_body(job))
+        if parts[2:] != ['result']:
+            return self._send_json(404, {'error': 'not found'})
+        if job['status'] != 'done':
+            return self._send_json(409, {'error': f"job is {job['status']}", 'job': self._job_body(job)})
+        path = self.service.cache.output_path(job['sha256'], job['format'])
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return self._send_json(410, {'error': 'result evicted from the cache, upload the PDF again'})
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPES[job['format']])
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Content-Disposition', f'attachment; filename="{job["sha256"][:12]}.{job["format"]}"')
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def _interrupt(signum, frame):
+    # Stop on SIGTERM the same way as on Ctrl-C
+    raise KeyboardInterrupt
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Serve PDF-to-entries extraction over HTTP')
+    arg_parser.add_argument('--host', default='127.0.0.1')
+    arg_parser.add_argument('--port', type=int, default=8765)
+    arg_parser.add_argument('--socket', help='listen on this Unix socket path instead of TCP')
+    arg_parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1,
+                            help='extraction worker processes')
+    arg_parser.add_argument('--max-queue', type=int, default=8,
+                            help='jobs allowed to wait once every worker is busy (then 503)')
+    arg_parser.add_argument('--cache-dir', default=CACHE_DIR, help='where results and uploads are kept')
+    args = arg_parser.parse_args()
+
+    service = ExtractionService(args.workers, args.max_queue, args.cache_dir)
+    workers, seconds = service.warm()
+    print(f"✅ {workers} workers warm in {seconds:.2f}s")
+
+    handler = type('Handler', (ServiceHandler,), {'service': service})
+    if args.socket:
+        if os.path.exists(args.socket):
+            os.remove(args.socket)
+        server = UnixHTTPServer(args.socket, handler)
+        where = f"unix:{args.socket}"
+    else:
+        server = ThreadingHTTPServer((args.host, args.port), handler)
+        where = f"http://{args.host}:{server.server_address[1]}"
+    print(f"✅ Listening on {where} (queue capacity {service.workers + service.max_queue})")
+    signal.signal(signal.SIGTERM, _interrupt)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down")
+    finally:
+        server.server_close()
+        service.shutdown()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
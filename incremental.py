@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""Incremental re-extraction of revised report exports.
+
+Every page is fingerprinted from its content stream (plus the ToUnicode
+maps of its fonts, which decide what text those bytes spell), which is
+cheap next to pdfplumber's layout analysis. Pages whose fingerprint has
+been seen before reuse their cached text lines.
+
+Parsed entries are cached per page too, keyed by the page's lines plus
+CONTEXT lines on either side: an entry is resolved from a window of
+neighbouring lines, so a page's entries can only change if something
+within that reach changed. Runs of pages that miss the cache are reparsed
+together, with CONTEXT boundary lines on each side, and only the entries
+whose duration line falls on those pages are kept.
+"""
+import csv
+import hashlib
+import os
+import time
+
+import entry_output
+import pdf_lines
+import toggl_parser
+from roster import default_roster
+from time_entry import TimeEntry
+
+CACHE_DIR = os.path.join(os.path.dirname(pdf_lines.CACHE_DIR), 'incremental')
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+CACHE_VERSION = 1
+# Lines on each side of a page that can influence its entries
+CONTEXT = toggl_parser.LOOKBEHIND + toggl_parser.LOOKAHEAD
+
+
+def page_fingerprint(page):
+    """SHA-256 of a pdfplumber page's content streams and font text maps."""
+    from pdfminer.pdftypes import PDFStream, resolve1
+
+    digest = hashlib.sha256()
+    page_obj = page.page_obj
+    for stream in page_obj.contents:
+        digest.update(resolve1(stream).get_data())
+    fonts = resolve1(page_obj.resources.get('Font')) or {}
+    for name in sorted(fonts):
+        digest.update(name.encode())
+        font = resolve1(fonts[name])
+        to_unicode = resolve1(font.get('ToUnicode')) if isinstance(font, dict) else None
+        if isinstance(to_unicode, PDFStream):
+            digest.update(to_unicode.get_data())
+    return digest.hexdigest()
+
+
+def _read(cache_dir, kind, key):
+    if cache_dir is None:
+        return None
+    return pdf_lines.read_cache(os.path.join(cache_dir, kind, f"{key}.json"), CACHE_VERSION)
+
+
+def _write(cache_dir, kind, key, value):
+    if cache_dir is not None:
+        pdf_lines.write_cache(os.path.join(cache_dir, kind, f"{key}.json"), value, CACHE_VERSION)
+
+
+def read_pages(pdf_path, cache_dir=CACHE_DIR):
+    """[{'page', 'lines', 'fingerprint', 'reused'}], extracting only unseen pages."""
+    import pdfplumber
+
+    pages = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for index, page in enumerate(pdf.pages):
+            fingerprint = page_fingerprint(page)
+            lines = _read(cache_dir, 'pages', fingerprint)
+            reused = lines is not None
+            if not reused:
+                page_text = page.extract_text()
+                lines = page_text.split('\n') if page_text else []
+                _write(cache_dir, 'pages', fingerprint, lines)
+            page.close()
+            pages.append({'page': index + 1, 'lines': lines, 'fingerprint': fingerprint, 'reused': reused})
+    return pages
+
+
+def _context_key(all_lines, start, end, roster_key):
+    digest = hashlib.sha256(roster_key.encode())
+    for line in all_lines[max(0, start - CONTEXT):end + CONTEXT]:
+        digest.update(line.encode())
+        digest.update(b'\n')
+    # Where the page sits relative to the document edges changes the window too
+    digest.update(f"{min(start, CONTEXT)}:{min(len(all_lines) - end, CONTEXT)}".encode())
+    return digest.hexdigest()
+
+
+def _parse_run(all_lines, start, end, roster):
+    """Parse lines[start:end] with CONTEXT boundary lines on each side.
+
+    Returns (entries with their document line index, unmatched lines,
+    header total) for duration lines inside [start, end) only.
+    """
+    first = max(0, start - CONTEXT)
+    reconciliation = toggl_parser.new_reconciliation()
+    entries = []
+    for index, entry in toggl_parser.iter_indexed_entries(all_lines[first:end + CONTEXT], reconciliation, roster):
+        if start <= first + index < end:
+            entries.append((first + index, entry))
+    unmatched = []
+    for candidate in reconciliation['unmatched']:
+        if start <= first + candidate['line'] < end:
+            unmatched.append(dict(candidate, line=first + candidate['line']))
+    return entries, unmatched, reconciliation['header_total']
+
+
+def extract(pdf_path, cache_dir=CACHE_DIR, roster=None):
+    """Return (entries, reconciliation, stats) for pdf_path, reusing cached pages.
+
+    The entries and reconciliation are the same as a full
+    toggl_parser pass over the whole document.
+    """
+    roster = roster or default_roster()
+    roster_key = repr(sorted(roster.aliases.items()))
+
+    extract_start = time.perf_counter()
+    pages = read_pages(pdf_path, cache_dir)
+    extract_seconds = time.perf_counter() - extract_start
+
+    parse_start = time.perf_counter()
+    all_lines = pdf_lines.flatten(pages)
+    starts = pdf_lines.page_starts(pages)
+    bounds = [(start, start + len(page['lines'])) for start, page in zip(starts, pages)]
+    keys = [_context_key(all_lines, start, end, roster_key) for start, end in bounds]
+    records = [_read(cache_dir, 'entries', key) for key in keys]
+
+    # Reparse each run of consecutive cache misses in one go
+    index = 0
+    while index < len(pages):
+        if records[index] is not None:
+            index += 1
+            continue
+        last = index
+        while last + 1 < len(pages) and records[last + 1] is None:
+            last += 1
+        entries, unmatched, header_total = _parse_run(all_lines, bounds[index][0], bounds[last][1], roster)
+        for page_index in range(index, last + 1):
+            start, end = bounds[page_index]
+            record = {
+                'entries': [entry.as_dict() for line, entry in entries if start <= line < end],
+                'unmatched': [dict(c, line=c['line'] - start) for c in unmatched if start <= c['line'] < end],
+                'header_total': header_total if page_index == 0 else None,
+            }
+            _write(cache_dir, 'entries', keys[page_index], record)
+            records[page_index] = dict(record, reparsed=True)
+        index = last + 1
+
+    entries = []
+    reconciliation = toggl_parser.new_reconciliation()
+    reconciliation['header_total'] = records[0]['header_total'] if records else None
+    for (start, _), record in zip(bounds, records):
+        entries.extend(TimeEntry.from_dict(entry) for entry in record['entries'])
+        reconciliation['unmatched'].extend(dict(c, line=c['line'] + start) for c in record['unmatched'])
+    reconciliation['entries_total'] = sum(entry.seconds for entry in entries)
+    if reconciliation['header_total'] is not None:
+        delta = reconciliation['header_total'] - reconciliation['entries_total']
+        reconciliation['delta'] = delta
+        reconciliation['explained'] = delta == sum(c['seconds'] for c in reconciliation['unmatched'])
+
+    if cache_dir is not None:
+        for kind in ('pages', 'entries'):
+            pdf_lines.evict(os.path.join(cache_dir, kind), CACHE_MAX_BYTES // 2)
+
+    stats = {
+        'pages': len(pages),
+        'pages_extracted': sum(1 for page in pages if not page['reused']),
+        'pages_reparsed': sum(1 for record in records if record.get('reparsed')),
+        'extract_seconds': extract_seconds,
+        'parse_seconds': time.perf_counter() - parse_start,
+        'page_starts': starts,
+    }
+    return entries, reconciliation, stats
+
+
+def read_csv_rows(path):
+    """Data rows of a previously written CSV, or None if there is none."""
+    try:
+        with entry_output.read_text(path) as f:
+            rows = list(csv.reader(f))
+    except FileNotFoundError:
+        return None
+    return rows[1:]
+
+
+def _row_key(row):
+    # Member, Date, Start Time, End Time
+    return (row[2], row[4], row[5], row[6])
+
+
+def diff_rows(old_rows, new_rows):
+    """{'added', 'removed', 'changed'} between two lists of CSV rows.
+
+    Rows identical in both are dropped first; of the rest, rows with the
+    same member, date and time range are paired up in order as 'changed'
+    ({'old': row, 'new': row}), and whatever is left is added or removed.
+    """
+    remaining = {}
+    for row in old_rows:
+        remaining.setdefault(tuple(row), []).append(row)
+    new_only = []
+    for row in new_rows:
+        same = remaining.get(tuple(row))
+        if same:
+            same.pop()
+        else:
+            new_only.append(row)
+
+    old_by_key = {}
+    for rows in remaining.values():
+        for row in rows:
+            old_by_key.setdefault(_row_key(row), []).append(row)
+
+    added = []
+    changed = []
+    for row in new_only:
+        candidates = old_by_key.get(_row_key(row))
+        if candidates:
+            changed.append({'old': candidates.pop(0), 'new': row})
+        else:
+            added.append(row)
+    removed = [row for rows in old_by_key.values() for row in rows]
+    return {'added': added, 'removed': removed, 'changed': changed}
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""Read time entries from whatever a report comes as, PDF last.
+
+    csv        the app's own CSV (plantilla-datos-toggl.csv, what the
+               extractors write), also .csv.gz / .csv.zst
+    toggl-csv  Toggl Track's detailed CSV export (User, Client, Project,
+               Description, Start date, Start time, ..., Duration, Tags)
+    json       a Toggl JSON export: an API v9 time_entries list (also the
+               app's enriched entries), a Reports API v2 {"data": [...]}
+               or a v3 detailed search with grouped time_entries
+    jsonl      the same records, one JSON object per line
+    pdf        the PDF report, parsed by toggl_parser from its extracted lines
+
+Every adapter yields TimeEntry records, so any of them feeds the same
+writers (extract_intek_final.write_entries) and loaders. The exports carry
+every field as data, so reading one is exact and needs no reconciliation,
+and it costs a fraction of the PDF path (see benchmark.py --adapters).
+
+detect() goes by extension, then the CSV header or the file's first
+bytes. resolve() swaps a PDF for a Toggl export saved next to it under
+the same name (report.pdf -> report.json, report.csv, ...) when there is
+one; an app-schema CSV there doesn't count, since that is usually the
+extractor's own output.
+
+The CSV and JSON Lines adapters stream row by row. A JSON document is
+parsed whole (the standard library has no incremental parser), which is
+fine at export sizes; export JSON Lines for very large ranges.
+"""
+import csv
+import datetime
+import json
+import os
+
+import entry_output
+import report_stats
+from roster import default_roster
+from time_entry import TimeEntry, date_ordinal
+
+FORMATS = ('csv', 'toggl-csv', 'json', 'jsonl', 'pdf')
+# Formats Toggl exports, which resolve() prefers to a PDF of the same report
+EXPORT_FORMATS = ('toggl-csv', 'json', 'jsonl')
+EXPORT_SUFFIXES = ('.json', '.jsonl', '.ndjson', '.csv', '.csv.gz', '.csv.zst')
+TOGGL_CSV_COLUMNS = ('start date', 'start time', 'duration')
+# Field names across the v9 API, the app's enriched entries and the Reports API
+MEMBER_FIELDS = ('user_name', 'username', 'user', 'member')
+PROJECT_FIELDS = ('project_name', 'project')
+CLIENT_FIELDS = ('client_name', 'client')
+TAG_FIELDS = ('tag_names', 'tags')
+
+
+def _csv_header(path):
+    with entry_output.read_text(path) as f:
+        return next(csv.reader(f), [])
+
+
+def detect(path):
+    """Input format of path (one of FORMATS), or ValueError."""
+    lower = path.lower()
+    if lower.endswith('.pdf'):
+        return 'pdf'
+    if lower.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    if lower.endswith('.json'):
+        return 'json'
+    try:
+        is_csv = entry_output.output_format(path) in ('csv', 'csv.gz', 'csv.zst')
+    except ValueError:
+        is_csv = False
+    if is_csv:
+        header = _csv_header(path)
+        if 'Duration (HH:MM:SS)' in header:
+            return 'csv'
+        columns = {name.strip().lower() for name in header}
+        if all(column in columns for column in TOGGL_CSV_COLUMNS):
+            return 'toggl-csv'
+        raise ValueError(f"Unrecognised CSV columns in {path}: {', '.join(header)}")
+    with open(path, 'rb') as f:
+        start = f.read(64).lstrip()
+    if start.startswith(b'%PDF'):
+        return 'pdf'
+    if start[:1] in (b'[', b'{'):
+        return 'json'
+    raise ValueError(f"Unsupported input {path} (expected a PDF, CSV or JSON export)")
+
+
+def find_export(pdf_path):
+    """A Toggl export saved next to pdf_path under the same name, or None."""
+    stem = os.path.splitext(pdf_path)[0]
+    for suffix in EXPORT_SUFFIXES:
+        candidate = stem + suffix
+        if os.path.exists(candidate):
+            try:
+                if detect(candidate) in EXPORT_FORMATS:
+                    return candidate
+            except ValueError:
+                continue
+    return None
+
+
+def resolve(path, prefer_exports=True):
+    """(format, path) to read: a sibling Toggl export instead of a PDF when there is one."""
+    fmt = detect(path)
+    if fmt == 'pdf' and prefer_exports:
+        export = find_export(path)
+        if export is not None:
+            return detect(export), export
+    return fmt, path
+
+
+class _Members:
+    """Export user names -> roster members ("Alberto García" -> "Alberto"), cached per name."""
+
+    def __init__(self, roster):
+        self.roster = roster
+        self.names = {}
+
+    def __call__(self, name):
+        member = self.names.get(name)
+        if member is None:
+            member = self.roster.canonical_member(name)
+            if member == name:
+                member = self.roster.find_member(name) or name
+            self.names[name] = member
+        return member
+
+
+def app_csv_entries(path, roster=None):
+    """TimeEntry records from a CSV in the app's schema (any entry_output text format)."""
+    with entry_output.read_text(path) as f:
+        for row in csv.DictReader(f):
+            yield TimeEntry(row['Description'], report_stats.duration_seconds(row['Duration (HH:MM:SS)']),
+                            row['Member'], row['Project'], date_ordinal(row['Date']), row['Start Time'],
+                            row['End Time'], row.get('Tags') or '')
+
+
+def _cell(row, index):
+    return row[index] if index is not None and index < len(row) else ''
+
+
+def toggl_csv_entries(path, roster=None):
+    """TimeEntry records from Toggl's detailed CSV export.
+
+    The project is Toggl's project (the client when there is none), as
+    the dashboard's CSV import expects; times are cut to HH:MM.
+    """
+    members = _Members(roster or default_roster())
+    with entry_output.read_text(path) as f:
+        reader = csv.reader(f)
+        columns = {name.strip().lower(): index for index, name in enumerate(next(reader, []))}
+        member_column = next((columns[name] for name in ('user', 'member', 'username') if name in columns), None)
+        project, client = columns.get('project'), columns.get('client')
+        description, tags = columns.get('description'), columns.get('tags')
+        start_date, start_time = columns['start date'], columns['start time']
+        end_time, duration = columns.get('end time'), columns['duration']
+        for row in reader:
+            if not row:
+                continue
+            yield TimeEntry(_cell(row, description), report_stats.duration_seconds(row[duration]),
+                            members(_cell(row, member_column)), _cell(row, project) or _cell(row, client),
+                            date_ordinal(row[start_date]), row[start_time][:5], _cell(row, end_time)[:5],
+                            _cell(row, tags))
+
+
+def _first(record, fields):
+    for field in fields:
+        value = record.get(field)
+        if value:
+            return value
+    return ''
+
+
+def _clock(timestamp):
+    """ISO timestamp -> (date ordinal, 'HH:MM') in the timestamp's own offset."""
+    if not timestamp:
+        return 0, ''
+    moment = datetime.datetime.fromisoformat(timestamp)
+    return moment.toordinal(), f"{moment.hour:02d}:{moment.minute:02d}"
+
+
+def _json_entry(record, members, start, stop, seconds):
+    """TimeEntry for one JSON time entry, or None while it is still running."""
+    if seconds is None or seconds < 0:
+        return None
+    day, start_time = _clock(start)
+    _, end_time = _clock(stop)
+    tags = _first(record, TAG_FIELDS)
+    if not isinstance(tags, str):
+        tags = ', '.join(str(tag) for tag in tags)
+    member = _first(record, MEMBER_FIELDS)
+    project = _first(record, PROJECT_FIELDS) or _first(record, CLIENT_FIELDS)
+    return TimeEntry(record.get('description') or '', int(seconds), members(member if isinstance(member, str) else ''),
+                     project if isinstance(project, str) else '', day, start_time, end_time, tags)
+
+
+def _json_records(record, members):
+    """Entries of one JSON record in any of the supported shapes."""
+    if 'time_entries' in record:
+        # Reports API v3 detailed search: one row per group, its entries nested
+        for item in record['time_entries']:
+            entry = _json_entry(record, members, item.get('start'), item.get('stop'), item.get('seconds'))
+            if entry is not None:
+                yield entry
+        return
+    if 'dur' in record:
+        # Reports API v2: milliseconds, 'end' instead of 'stop'
+        seconds = record['dur'] // 1000 if record['dur'] is not None else None
+        entry = _json_entry(record, members, record.get('start'), record.get('end'), seconds)
+    else:
+        entry = _json_entry(record, members, record.get('start'), record.get('stop'), record.get('duration'))
+    if entry is not None:
+        yield entry
+
+
+def json_entries(path, roster=None):
+    """TimeEntry records from a Toggl JSON export (a list, or an object with a 'data' list)."""
+    members = _Members(roster or default_roster())
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get('data') or data.get('time_entries') or data.get('entries') or []
+    for record in data:
+        yield from _json_records(record, members)
+
+
+def jsonl_entries(path, roster=None):
+    """TimeEntry records from JSON Lines, one time entry (or v3 group) per line."""
+    members = _Members(roster or default_roster())
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield from _json_records(json.loads(line), members)
+
+
+def pdf_entries(path, roster=None):
+    """TimeEntry records parsed from a report PDF (through the extracted-lines cache)."""
+    import pdf_lines
+    import toggl_parser
+
+    return toggl_parser.iter_entries(pdf_lines.load_lines(path), roster=roster)
+
+
+ADAPTERS = {
+    'csv': app_csv_entries,
+    'toggl-csv': toggl_csv_entries,
+    'json': json_entries,
+    'jsonl': jsonl_entries,
+    'pdf': pdf_entries,
+}
+
+
+def read_entries(path, fmt=None, roster=None):
+    """Iterator of TimeEntry records from path, detecting its format unless given."""
+    return ADAPTERS[fmt or detect(path)](path, roster)
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""Layout-aware entry extraction from pdfplumber word positions.
+
+Instead of guessing fields from neighbouring text lines, every word is
+bucketed into a Toggl column by its x position (column starts come from
+the DESCRIPTION / DURATION / MEMBER / ... header on each page) and into
+an entry row by its y position (each word belongs to the nearest
+duration in the DURATION column). That is one pass over the words per
+page with no neighbourhood rescans, and it copes with exports whose
+column order differs or whose fonts drop the ':' and '-' glyphs.
+
+The report's header total is read from the first page so the extracted
+entries can be reconciled against it.
+"""
+import bisect
+import re
+
+import report_stats
+from roster import default_roster
+from time_entry import TimeEntry, date_ordinal
+
+COLUMN_HEADERS = {
+    'DESCRIPTION': 'description',
+    'DURATION': 'duration',
+    'MEMBER': 'member',
+    'PROJECT': 'project',
+    'TIME': 'time_date',
+    'TAGS': 'tags',
+}
+# Cell text can start slightly left of its header word
+COLUMN_TOLERANCE = 4
+# Words whose bottoms are this close belong to the same visual line (the
+# taller '•' glyphs start higher than the text they precede, so tops differ)
+LINE_TOLERANCE = 3
+
+# Some exports lose the ':' / '-' glyphs, leaving "0 39 54" and "10 18   10 58"
+DURATION_RE = re.compile(r'^(\d+)[:\s](\d{2})[:\s](\d{2})$')
+TIME_RANGE_RE = re.compile(r'(\d{2})[:\s](\d{2})\s*-?\s*(\d{2})[:\s](\d{2})')
+DATE_RE = re.compile(r'(\d{2})/(\d{2})/(\d{4})')
+DEFAULT_TIME = '00:01'
+
+
+def _lines(words):
+    """Group words into visual lines: [(bottom, [words left to right])]."""
+    lines = []
+    for word in sorted(words, key=lambda w: (w['bottom'], w['x0'])):
+        if lines and abs(word['bottom'] - lines[-1][0]) <= LINE_TOLERANCE:
+            lines[-1][1].append(word)
+        else:
+            lines.append((word['bottom'], [word]))
+    return [(bottom, sorted(line, key=lambda w: w['x0'])) for bottom, line in lines]
+
+
+def _line_text(line_words):
+    return ' '.join(w['text'] for w in line_words)
+
+
+def clean_words(words):
+    """Apply clean_text to word texts ('\x00' separators -> spaces), dropping empties."""
+    cleaned = []
+    for word in words:
+        text = word['text'].replace('\x00', ' ').strip()
+        if text:
+            cleaned.append(dict(word, text=text))
+    return cleaned
+
+
+def find_columns(words):
+    """Return (header_bottom, [(x_start, field)]) from the table header, or None."""
+    for _, line in _lines(words):
+        texts = [w['text'] for w in line]
+        if 'DESCRIPTION' in texts and 'DURATION' in texts:
+            columns = sorted(
+                (w['x0'] - COLUMN_TOLERANCE, COLUMN_HEADERS[w['text']])
+                for w in line if w['text'] in COLUMN_HEADERS
+            )
+            return max(w['bottom'] for w in line), columns
+    return None
+
+
+def _column_of(word, starts, fields):
+    index = bisect.bisect_right(starts, word['x0']) - 1
+    return fields[index] if index >= 0 else None
+
+
+def header_total(words):
+    """Grand total (seconds) printed under 'Total Hours' on the first page."""
+    for bottom, line in _lines(words):
+        if _line_text(line).startswith('Total Hours'):
+            label_x = line[0]['x0']
+            for _, below in _lines(w for w in words if w['top'] > bottom):
+                first = below[0]
+                if abs(first['x0'] - label_x) <= COLUMN_TOLERANCE:
+                    match = DURATION_RE.match(first['text'])
+                    return report_stats.duration_seconds(':'.join(match.groups())) if match else None
+                break
+    return None
+
+
+def page_entries(words, roster=None):
+    """Entries on one page, in document order."""
+    roster = roster or default_roster()
+    layout = find_columns(words)
+    if not layout:
+        return []
+    header_bottom, columns = layout
+    starts = [x for x, _ in columns]
+    fields = [f for _, f in columns]
+
+    table_words = []
+    for word in words:
+        if word['top'] <= header_bottom:
+            continue
+        field = _column_of(word, starts, fields)
+        if field:
+            table_words.append((field, word))
+
+    # Footer ("Tres Puntos Page 3/18") sits below the last row
+    footer_top = None
+    for _, line in _lines(w for _, w in table_words):
+        if 'Page' in [w['text'] for w in line]:
+            footer_top = min(w['top'] for w in line)
+    if footer_top is not None:
+        table_words = [(f, w) for f, w in table_words if w['bottom'] <= footer_top]
+
+    anchors = []
+    for _, line in _lines(w for f, w in table_words if f == 'duration'):
+        match = DURATION_RE.match(_line_text(line))
+        if match:
+            top = min(w['top'] for w in line)
+            bottom = max(w['bottom'] for w in line)
+            anchors.append(((top + bottom) / 2, match.groups()))
+    if not anchors:
+        return []
+
+    # Row boundaries are the midpoints between consecutive durations
+    centers = [center for center, _ in anchors]
+    cells = [{} for _ in anchors]
+    for field, word in table_words:
+        if field == 'duration':
+            continue
+        center = (word['top'] + word['bottom']) / 2
+        index = bisect.bisect_left(centers, center)
+        if index == len(centers) or (index > 0 and center - centers[index - 1] < centers[index] - center):
+            index -= 1
+        cells[index].setdefault(field, []).append(word)
+
+    entries = []
+    for (center, (h, m, s)), cell in zip(anchors, cells):
+        text = {field: ' '.join(_line_text(line) for _, line in _lines(cell_words))
+                for field, cell_words in cell.items()}
+
+        project_parts = [part.strip() for part in text.get('project', '').split('•') if part.strip()]
+        project = roster.canonical_project(project_parts[-1]) if project_parts else ''
+
+        description = ' '.join(text.get('description', '').split())
+        if len(description) < 3:
+            description = project
+
+        member = text.get('member', '').strip()
+        member = roster.canonical_member(member)
+
+        time_date = text.get('time_date', '')
+        time_match = TIME_RANGE_RE.search(time_date)
+        date_match = DATE_RE.search(time_date)
+
+        tags = text.get('tags', '').strip()
+        seconds = report_stats.hms_seconds(h, m, s)
+        entries.append(TimeEntry(
+            description,
+            seconds,
+            member,
+            project,
+            date_ordinal(f"{date_match.group(3)}-{date_match.group(1)}-{date_match.group(2)}") if date_match else 0,
+            f"{time_match.group(1)}:{time_match.group(2)}" if time_match else DEFAULT_TIME,
+            f"{time_match.group(3)}:{time_match.group(4)}" if time_match else DEFAULT_TIME,
+            '' if tags == '-' else tags,
+        ))
+    return entries
+
+
+def extract_entries(pdf_path, roster=None):
+    """Return (entries, reconciliation) for pdf_path.
+
+    reconciliation has the same shape as toggl_parser.new_reconciliation();
+    header_total and delta are None when the header total is unreadable.
+    Every duration becomes an entry here, so nothing is ever unmatched.
+    """
+    import pdfplumber
+
+    entries = []
+    expected = None
+    with pdfplumber.open(pdf_path) as pdf:
+        for index, page in enumerate(pdf.pages):
+            words = clean_words(page.extract_words(use_text_flow=True))
+            if index == 0:
+                expected = header_total(words)
+            entries.extend(page_entries(words, roster))
+            page.close()
+
+    actual = sum(entry.seconds for entry in entries)
+    delta = expected - actual if expected is not None else None
+    return entries, {
+        'header_total': expected,
+        'entries_total': actual,
+        'delta': delta,
+        'unmatched': [],
+        'explained': delta == 0,
+    }
@@ -111,6 +111,33 @@ export async function initializeDatabase() {
       CREATE INDEX IF NOT EXISTS idx_api_usage_api_key_timestamp ON api_usage_log(api_key_id, timestamp)
     `;
 
+    // Tabla de entradas extraídas de los PDF de Toggl (la llena db_loader.py)
+    // entry_hash identifica cada entrada, así que recargar un reporte no la duplica
+    await sql`
+      CREATE TABLE IF NOT EXISTS time_entries (
+        entry_hash VARCHAR(64) PRIMARY KEY,
+        report_id VARCHAR(255),
+        description TEXT NOT NULL,
+        duration_seconds INTEGER NOT NULL,
+        member VARCHAR(255),
+        project VARCHAR(255),
+        entry_date VARCHAR(50),
+        start_time VARCHAR(10),
+        end_time VARCHAR(10),
+        tags TEXT,
+        source VARCHAR(500),
+        created_on TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+      )
+    `;
+
+    await sql`
+      CREATE INDEX IF NOT EXISTS idx_time_entries_member_date ON time_entries(member, entry_date)
+    `;
+
+    await sql`
+      CREATE INDEX IF NOT EXISTS idx_time_entries_report_id ON time_entries(report_id)
+    `;
+
     console.log('Database initialized successfully');
   } catch (error) {
     console.error('Error initializing database:', error);
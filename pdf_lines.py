@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""Text-line extraction from Toggl PDF reports.
+
+Pages can be fanned out over a pool of worker processes: each worker opens
+the PDF once and extracts a contiguous page range, and the results are put
+back in page order so the line list is the same as a serial run.
+
+Extracted pages are cached on disk keyed by the SHA-256 of the PDF bytes,
+so every script that looks at the same report only pays for pdfplumber
+once. A changed PDF hashes to a new key; stale entries are evicted least
+recently used first once the cache grows past CACHE_MAX_BYTES.
+
+read_cache()/write_cache()/evict() are the one on-disk cache format the
+other caches (incremental, extract_service, query_csv's index) share: a
+versioned JSON file per key, written atomically, evicted by mtime.
+"""
+import bisect
+import contextlib
+import hashlib
+import json
+import os
+import time
+
+CACHE_DIR = os.environ.get(
+    'PDF_LINES_CACHE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'pdf_lines'),
+)
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+CACHE_VERSION = 2
+
+
+def _extract_range(pdf_path, first, last, progress=None):
+    """Extract pages [first, last) of pdf_path (0-based) in this process.
+
+    progress(page_number, total_pages) is called after each page, if given.
+    """
+    import pdfplumber
+
+    pages = []
+    open_start = time.perf_counter()
+    with pdfplumber.open(pdf_path) as pdf:
+        open_seconds = time.perf_counter() - open_start
+        for index in range(first, last):
+            start = time.perf_counter()
+            cpu_start = time.process_time()
+            page_text = pdf.pages[index].extract_text()
+            pages.append({
+                'page': index + 1,
+                'lines': page_text.split('\n') if page_text else [],
+                'seconds': time.perf_counter() - start,
+                'cpu_seconds': time.process_time() - cpu_start,
+            })
+            if progress is not None:
+                progress(index + 1, len(pdf.pages))
+    # Opening the document is paid once per range; charge it to its first page
+    if pages:
+        pages[0]['open_seconds'] = open_seconds
+    return pages
+
+
+def page_count(pdf_path):
+    import pdfplumber
+
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+
+def split_ranges(total, parts):
+    """Split range(total) into at most `parts` contiguous (first, last) chunks."""
+    parts = max(1, min(parts, total))
+    size, extra = divmod(total, parts)
+    ranges = []
+    first = 0
+    for i in range(parts):
+        last = first + size + (1 if i < extra else 0)
+        ranges.append((first, last))
+        first = last
+    return ranges
+
+
+def extract_pages(pdf_path, workers=1, progress=None):
+    """Return one dict per page: {'page': n, 'lines': [...], 'seconds': t}.
+
+    workers <= 1 extracts serially in this process; otherwise the page ranges
+    are spread over that many processes (0 or None means one per CPU).
+    progress is only called on the serial path.
+    """
+    if workers is None or workers == 0:
+        workers = os.cpu_count() or 1
+    total = page_count(pdf_path)
+    if workers <= 1 or total <= 1:
+        return _extract_range(pdf_path, 0, total, progress)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    ranges = split_ranges(total, workers)
+    pages = []
+    with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+        futures = [pool.submit(_extract_range, pdf_path, first, last) for first, last in ranges]
+        # Ranges are contiguous and submitted in order, so collecting the
+        # futures in submission order keeps the pages in document order.
+        for future in futures:
+            pages.extend(future.result())
+    return pages
+
+
+def iter_pages(pdf_path):
+    """Yield pages one at a time, dropping each page's parsed layout once read.
+
+    Unlike extract_pages() nothing is accumulated, so memory stays flat no
+    matter how many pages the report has.
+    """
+    import pdfplumber
+
+    with pdfplumber.open(pdf_path) as pdf:
+        for index, page in enumerate(pdf.pages):
+            start = time.perf_counter()
+            cpu_start = time.process_time()
+            page_text = page.extract_text()
+            seconds = time.perf_counter() - start
+            cpu_seconds = time.process_time() - cpu_start
+            page.close()
+            yield {
+                'page': index + 1,
+                'lines': page_text.split('\n') if page_text else [],
+                'seconds': seconds,
+                'cpu_seconds': cpu_seconds,
+            }
+
+
+def iter_lines(pages, page_starts=None):
+    """Yield the lines of each page in turn.
+
+    If page_starts is a list, the document-wide index of each page's first
+    line is appended to it as the pages go by (see locate()).
+    """
+    index = 0
+    for page in pages:
+        if page_starts is not None:
+            page_starts.append(index)
+        yield from page['lines']
+        index += len(page['lines'])
+
+
+def page_starts(pages):
+    starts = []
+    index = 0
+    for page in pages:
+        starts.append(index)
+        index += len(page['lines'])
+    return starts
+
+
+def locate(line_index, starts):
+    """Document-wide line index -> (page number, 1-based line within the page)."""
+    page = bisect.bisect_right(starts, line_index)
+    return page, line_index - starts[page - 1] + 1
+
+
+def flatten(pages):
+    """Concatenate the page line lists in page order."""
+    text_lines = []
+    for page in pages:
+        text_lines.extend(page['lines'])
+    return text_lines
+
+
+def extract_lines(pdf_path, workers=1):
+    return flatten(extract_pages(pdf_path, workers))
+
+
+def print_page_timings(pages, wall_seconds=None):
+    page_total = sum(page['seconds'] for page in pages)
+    for page in pages:
+        cpu = f", cpu {page['cpu_seconds'] * 1000:8.1f} ms" if 'cpu_seconds' in page else ''
+        opened = f", open {page['open_seconds'] * 1000:.1f} ms" if 'open_seconds' in page else ''
+        print(f"  page {page['page']:>4}: {len(page['lines']):>4} lines, {page['seconds'] * 1000:8.1f} ms{cpu}{opened}")
+    summary = f"  {len(pages)} pages, {page_total:.2f}s of page extraction"
+    if wall_seconds is not None:
+        summary += f" in {wall_seconds:.2f}s wall"
+    print(summary)
+
+
+def file_digest(pdf_path):
+    digest = hashlib.sha256()
+    with open(pdf_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_path(cache_dir, digest):
+    return os.path.join(cache_dir, f"{digest}.json")
+
+
+@contextlib.contextmanager
+def atomic_open(path, mode='w'):
+    """Open path for writing through a temporary file that replaces it on success.
+
+    Readers never see a half-written file, and a failed write leaves the
+    old one in place.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, mode, **({} if 'b' in mode else {'encoding': 'utf-8'})) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def read_cache(path, version=CACHE_VERSION):
+    """The value write_cache() stored at path, or None if it is missing,
+    unreadable or written for another version.
+
+    A hit bumps the file's mtime: evict() drops the least recently used first.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('version') != version or 'value' not in data:
+        return None
+    os.utime(path)
+    return data['value']
+
+
+def write_cache(path, value, version=CACHE_VERSION):
+    """Store a JSON-serializable value at path, atomically."""
+    with atomic_open(path) as f:
+        json.dump({'version': version, 'value': value}, f, ensure_ascii=False)
+
+
+def evict(cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES, keep=None, companions=None):
+    """Delete least recently used cache files until the cache fits max_bytes.
+
+    Entries are the .json files in cache_dir; companions(path), when given,
+    names the other files that belong to an entry, which are counted in its
+    size and deleted with it.
+    """
+    try:
+        names = [name for name in os.listdir(cache_dir) if name.endswith('.json')]
+    except FileNotFoundError:
+        return
+    files = []
+    for name in names:
+        path = os.path.join(cache_dir, name)
+        paths = [path] + (list(companions(path)) if companions else [])
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            continue
+        size = 0
+        for member in paths:
+            try:
+                size += os.stat(member).st_size
+            except FileNotFoundError:
+                pass
+        files.append((mtime, size, path, paths))
+    total = sum(size for _, size, _, _ in files)
+    for _, size, path, paths in sorted(files):
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        for member in paths:
+            try:
+                os.remove(member)
+            except FileNotFoundError:
+                pass
+        total -= size
+
+
+def cached_extract(pdf_path, workers=1, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES, progress=None):
+    """extract_pages() through the on-disk cache; returns (pages, cache_hit).
+
+    cache_dir=None bypasses the cache entirely.
+    """
+    if cache_dir is None:
+        return extract_pages(pdf_path, workers, progress), False
+    path = _cache_path(cache_dir, file_digest(pdf_path))
+    pages = read_cache(path)
+    if pages is not None:
+        return pages, True
+    pages = extract_pages(pdf_path, workers, progress)
+    write_cache(path, pages)
+    evict(cache_dir, max_bytes, keep=path)
+    return pages, False
+
+
+def load_lines(pdf_path, workers=1, cache_dir=CACHE_DIR):
+    """Flat line list for pdf_path, served from the cache when possible."""
+    pages, _ = cached_extract(pdf_path, workers, cache_dir)
+    return flatten(pages)
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Opt-in timing and counters for the extraction pipeline.
+
+Nothing here costs anything unless a Profiler is started: stage() is a
+no-op context manager and count() returns immediately. Once started,
+
+- stage(name) records wall and CPU time for a block,
+- count(name, n) bumps a named counter,
+- instrument(module, functions) swaps the named module functions for
+  wrappers that count calls and accumulate their (inclusive) wall time,
+  and every compiled regex in the module for a proxy that counts its
+  evaluations. Calls made through module globals pick the wrappers up, so
+  the hot code itself carries no instrumentation. stop() puts the
+  originals back.
+"""
+import cProfile
+import json
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+_active = None
+
+
+class CountingPattern:
+    """Compiled regex proxy counting every evaluation under `name`."""
+
+    __slots__ = ('pattern', 'name', 'counters')
+
+    def __init__(self, pattern, name, counters):
+        self.pattern = pattern
+        self.name = name
+        self.counters = counters
+
+    def _counted(method):
+        def wrapper(self, *args, **kwargs):
+            self.counters[self.name] += 1
+            return getattr(self.pattern, method)(*args, **kwargs)
+        return wrapper
+
+    search = _counted('search')
+    match = _counted('match')
+    fullmatch = _counted('fullmatch')
+    sub = _counted('sub')
+    finditer = _counted('finditer')
+    findall = _counted('findall')
+    split = _counted('split')
+    del _counted
+
+    def __getattr__(self, attr):
+        return getattr(self.pattern, attr)
+
+
+class Profiler:
+    def __init__(self, cprofile_path=None):
+        self.stages = {}
+        self.functions = {}
+        self.counters = Counter()
+        self.pages = []
+        self.cprofile_path = cprofile_path
+        self._cprofile = None
+        self._patched = []
+
+    def start(self):
+        global _active
+        _active = self
+        if self.cprofile_path:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        return self
+
+    def stop(self):
+        global _active
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.cprofile_path)
+            self._cprofile = None
+        for owner, attr, original in reversed(self._patched):
+            setattr(owner, attr, original)
+        self._patched = []
+        if _active is self:
+            _active = None
+
+    @contextmanager
+    def stage(self, name):
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            totals = self.stages.setdefault(name, [0.0, 0.0, 0])
+            totals[0] += time.perf_counter() - wall
+            totals[1] += time.process_time() - cpu
+            totals[2] += 1
+
+    def _timed(self, function, name):
+        functions = self.functions
+
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                totals = functions.setdefault(name, [0.0, 0])
+                totals[0] += time.perf_counter() - start
+                totals[1] += 1
+        return wrapper
+
+    def _patch(self, owner, attr, replacement):
+        self._patched.append((owner, attr, getattr(owner, attr)))
+        setattr(owner, attr, replacement)
+
+    def instrument(self, owner, functions=(), prefix=None):
+        """Time `functions` of owner and count evaluations of its compiled regexes."""
+        prefix = prefix or getattr(owner, '__name__', type(owner).__name__)
+        for name in functions:
+            self._patch(owner, name, self._timed(getattr(owner, name), f"{prefix}.{name}"))
+        for attr, value in list(vars(owner).items()):
+            if isinstance(value, re.Pattern):
+                self._patch(owner, attr, CountingPattern(value, f"regex {prefix}.{attr}", self.counters))
+
+    def add_page(self, page):
+        """Record a pdf_lines page dict's timings (its lines are not kept)."""
+        timings = {key: page[key] for key in ('page', 'seconds', 'cpu_seconds', 'open_seconds') if key in page}
+        timings['lines'] = len(page['lines'])
+        self.pages.append(timings)
+
+    def to_dict(self):
+        return {
+            'stages': {name: {'wall_seconds': wall, 'cpu_seconds': cpu, 'calls': calls}
+                       for name, (wall, cpu, calls) in self.stages.items()},
+            'functions': {name: {'wall_seconds': wall, 'calls': calls}
+                          for name, (wall, calls) in self.functions.items()},
+            'counters': dict(self.counters),
+            'pages': self.pages,
+        }
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def print_report(self):
+        print("\nProfile:")
+        print(f"  {'stage':<28} {'wall':>9} {'cpu':>9}")
+        for name, (wall, cpu, calls) in self.stages.items():
+            suffix = f"  x{calls}" if calls > 1 else ''
+            print(f"  {name:<28} {wall * 1000:7.1f}ms {cpu * 1000:7.1f}ms{suffix}")
+        if self.pages:
+            slowest = sorted(self.pages, key=lambda page: page.get('seconds', 0), reverse=True)[:5]
+            print(f"  pages: {len(self.pages)}, slowest:")
+            for page in slowest:
+                cpu = f", cpu {page['cpu_seconds'] * 1000:.1f}ms" if 'cpu_seconds' in page else ''
+                print(f"    page {page['page']:>4}: {page['lines']:>4} lines, "
+                      f"wall {page.get('seconds', 0) * 1000:.1f}ms{cpu}")
+        if self.functions:
+            print(f"  {'function (inclusive)':<44} {'calls':>9} {'wall':>9}")
+            for name, (wall, calls) in sorted(self.functions.items(), key=lambda item: item[1][0], reverse=True):
+                print(f"  {name:<44} {calls:>9} {wall * 1000:7.1f}ms")
+        if self.counters:
+            print(f"  {'counter':<44} {'count':>9}")
+            for name, count in sorted(self.counters.items()):
+                print(f"  {name:<44} {count:>9}")
+        if self.cprofile_path:
+            print(f"  cProfile stats saved to {self.cprofile_path} (snakeviz / flameprof / gprof2dot)")
+
+
+@contextmanager
+def _nothing():
+    yield
+
+
+def stage(name):
+    """Time a block under `name` if a profiler is running."""
+    return _active.stage(name) if _active is not None else _nothing()
+
+
+def count(name, n=1):
+    if _active is not None:
+        _active.counters[name] += n
+
+
+def active():
+    return _active
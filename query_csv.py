@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""Totals and group-bys over every extracted report CSV.
+
+    python query_csv.py                                  # total per report
+    python query_csv.py --by member
+    python query_csv.py --by project --member Dani --from 2025-01-01
+    python query_csv.py --by month --desc endpoint 'reportes_csv/intek*.csv'
+
+Each CSV is parsed once into typed columns (integer seconds, date as a
+day number, member/project/description as codes into small string
+tables) and that index is saved under .cache/query/. Later queries load
+the index with array.frombytes instead of re-reading the CSV, and only
+rebuild it for files whose size or mtime changed. Filters on member,
+project and description are resolved against the string tables first,
+so scanning the rows only compares integers.
+"""
+import argparse
+import csv
+import datetime
+import glob
+import hashlib
+import json
+import os
+import time
+from array import array
+
+import entry_output
+import pdf_lines
+import report_stats
+
+INDEX_DIR = os.path.join(os.path.dirname(pdf_lines.CACHE_DIR), 'query')
+INDEX_VERSION = 2
+INDEX_MAX_BYTES = 64 * 1024 * 1024
+NO_DATE = -(2 ** 31)
+# Typed columns, in the order they are stored in an index file
+COLUMNS = (('seconds', 'q'), ('days', 'i'), ('member', 'i'), ('project', 'i'), ('description', 'i'))
+GROUPS = ('report', 'member', 'project', 'date', 'month', 'description')
+
+
+class ReportColumns:
+    """One report's entries as parallel typed arrays plus their string tables."""
+
+    def __init__(self, source):
+        self.source = source
+        self.name = os.path.basename(source)
+        self.columns = {name: array(code) for name, code in COLUMNS}
+        self.tables = {'member': [], 'project': [], 'description': []}
+        self._codes = {field: {} for field in self.tables}
+
+    def __len__(self):
+        return len(self.columns['seconds'])
+
+    def _code(self, field, value):
+        codes = self._codes[field]
+        # Descriptions group case-insensitively, like report_stats.EntryColumns
+        key = value.lower() if field == 'description' else value
+        code = codes.get(key)
+        if code is None:
+            code = codes[key] = len(self.tables[field])
+            self.tables[field].append(value)
+        return code
+
+    def append_row(self, row):
+        self.columns['seconds'].append(report_stats.duration_seconds(row['Duration (HH:MM:SS)']))
+        days = entry_output.date_days(row['Date'])
+        self.columns['days'].append(NO_DATE if days is None else days)
+        self.columns['member'].append(self._code('member', row['Member']))
+        self.columns['project'].append(self._code('project', row['Project']))
+        self.columns['description'].append(self._code('description', row['Description'].strip()))
+
+    @classmethod
+    def from_csv(cls, path):
+        report = cls(path)
+        with entry_output.read_text(path) as f:
+            for row in csv.DictReader(f):
+                report.append_row(row)
+        return report
+
+
+def _index_paths(source, index_dir):
+    key = hashlib.sha256(os.path.abspath(source).encode()).hexdigest()[:32]
+    return os.path.join(index_dir, f"{key}.json"), os.path.join(index_dir, f"{key}.bin")
+
+
+def _stamp(source):
+    stat = os.stat(source)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def load_report(source, index_dir=INDEX_DIR):
+    """(ReportColumns, from_index) for source, rebuilding its index if stale."""
+    if index_dir is None:
+        return ReportColumns.from_csv(source), False
+    meta_path, data_path = _index_paths(source, index_dir)
+    stamp = _stamp(source)
+    meta = pdf_lines.read_cache(meta_path, INDEX_VERSION)
+    if meta is not None and meta.get('stamp') == stamp:
+        try:
+            report = ReportColumns(source)
+            report.tables = meta['tables']
+            with open(data_path, 'rb') as f:
+                for name, code in COLUMNS:
+                    report.columns[name].frombytes(f.read(meta['rows'] * report.columns[name].itemsize))
+            return report, True
+        except (OSError, ValueError, KeyError):
+            pass
+
+    report = ReportColumns.from_csv(source)
+    with pdf_lines.atomic_open(data_path, 'wb') as f:
+        for name, _ in COLUMNS:
+            report.columns[name].tofile(f)
+    # The metadata goes last: it is what marks the index as valid
+    pdf_lines.write_cache(meta_path, {'source': os.path.abspath(source), 'stamp': stamp,
+                                      'rows': len(report), 'tables': report.tables}, INDEX_VERSION)
+    pdf_lines.evict(index_dir, INDEX_MAX_BYTES, keep=meta_path, companions=lambda path: [path[:-len('.json')] + '.bin'])
+    return report, False
+
+
+def find_csvs(patterns):
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, '*.csv')
+        paths.extend(glob.glob(pattern))
+    return sorted(set(paths))
+
+
+def _allowed(table, wanted, match):
+    """Codes in a string table that pass a filter, or None for no filter."""
+    if wanted is None:
+        return None
+    return {code for code, value in enumerate(table) if match(value, wanted)}
+
+
+def _day_label(days, monthly):
+    if days == NO_DATE:
+        return '(no date)'
+    day = datetime.date.fromordinal(days + entry_output.EPOCH_ORDINAL)
+    return day.strftime('%Y-%m') if monthly else day.isoformat()
+
+
+def _filter_days(date, name):
+    if not date:
+        return None
+    days = entry_output.date_days(date)
+    if days is None:
+        raise ValueError(f"{name} must be a YYYY-MM-DD date, not {date!r}")
+    return days
+
+
+def iso_date(text):
+    """argparse type for --from/--to."""
+    try:
+        datetime.date.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a YYYY-MM-DD date: {text!r}")
+    return text
+
+
+def query(reports, by='report', member=None, project=None, date_from=None, date_to=None, desc=None):
+    """{group label: [entries, seconds]} over reports, after the filters.
+
+    member and project match exactly (case-insensitive); desc is a
+    case-insensitive substring; date_from/date_to are inclusive ISO dates
+    (ValueError if either doesn't parse).
+    """
+    first = _filter_days(date_from, 'date_from')
+    last = _filter_days(date_to, 'date_to')
+    exact = lambda value, wanted: value.lower() == wanted.lower()
+    contains = lambda value, wanted: wanted.lower() in value.lower()
+
+    results = {}
+    for report in reports:
+        members = _allowed(report.tables['member'], member, exact)
+        projects = _allowed(report.tables['project'], project, exact)
+        descriptions = _allowed(report.tables['description'], desc, contains)
+        columns = report.columns
+        labels = {}
+        for seconds, days, member_code, project_code, desc_code in zip(
+                columns['seconds'], columns['days'], columns['member'],
+                columns['project'], columns['description']):
+            if members is not None and member_code not in members:
+                continue
+            if projects is not None and project_code not in projects:
+                continue
+            if descriptions is not None and desc_code not in descriptions:
+                continue
+            if first is not None and (days == NO_DATE or days < first):
+                continue
+            if last is not None and (days == NO_DATE or days > last):
+                continue
+            if by == 'report':
+                key = report.name
+            elif by in ('date', 'month'):
+                key = days
+            else:
+                key = (member_code, project_code, desc_code)[('member', 'project', 'description').index(by)]
+            total = labels.get(key)
+            if total is None:
+                labels[key] = [1, seconds]
+            else:
+                total[0] += 1
+                total[1] += seconds
+
+        for key, (count, seconds) in labels.items():
+            if by == 'report':
+                label = key
+            elif by in ('date', 'month'):
+                label = _day_label(key, by == 'month')
+            else:
+                label = report.tables[by][key]
+            total = results.setdefault(label, [0, 0])
+            total[0] += count
+            total[1] += seconds
+    return results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Query totals across extracted report CSVs')
+    arg_parser.add_argument('csvs', nargs='*', default=['reportes_csv'],
+                            help='CSV files, globs or directories (default: reportes_csv/)')
+    arg_parser.add_argument('--by', choices=GROUPS, default='report', help='group the totals by this field')
+    arg_parser.add_argument('--member')
+    arg_parser.add_argument('--project')
+    arg_parser.add_argument('--from', dest='date_from', metavar='YYYY-MM-DD', type=iso_date)
+    arg_parser.add_argument('--to', dest='date_to', metavar='YYYY-MM-DD', type=iso_date)
+    arg_parser.add_argument('--desc', help='description contains (case-insensitive)')
+    arg_parser.add_argument('--sort', choices=['hours', 'label'], default=None,
+                            help='default: label for report/date/month, hours otherwise')
+    arg_parser.add_argument('--limit', type=int, default=None, help='show at most this many groups')
+    arg_parser.add_argument('--json', action='store_true', help='print the result as JSON')
+    arg_parser.add_argument('--no-index', action='store_true', help='read the CSVs directly, ignoring the index')
+    args = arg_parser.parse_args()
+
+    paths = find_csvs(args.csvs)
+    if not paths:
+        print(f"No CSVs found for {' '.join(args.csvs)}")
+        return 1
+
+    load_start = time.perf_counter()
+    reports = []
+    rebuilt = 0
+    for path in paths:
+        report, from_index = load_report(path, None if args.no_index else INDEX_DIR)
+        reports.append(report)
+        rebuilt += not from_index
+    load_ms = (time.perf_counter() - load_start) * 1000
+
+    query_start = time.perf_counter()
+    results = query(reports, args.by, args.member, args.project, args.date_from, args.date_to, args.desc)
+    query_ms = (time.perf_counter() - query_start) * 1000
+
+    sort = args.sort or ('label' if args.by in ('report', 'date', 'month') else 'hours')
+    if sort == 'label':
+        rows = sorted(results.items())
+    else:
+        rows = sorted(results.items(), key=lambda item: item[1][1], reverse=True)
+    if args.limit is not None:
+        rows = rows[:args.limit]
+
+    if args.json:
+        print(json.dumps([{args.by: label, 'entries': count, 'seconds': seconds}
+                          for label, (count, seconds) in rows], indent=2, ensure_ascii=False))
+        return 0
+
+    width = max([len(args.by)] + [len(label) for label, _ in rows])
+    for label, (count, seconds) in rows:
+        print(f"{label:<{width}}  {count:>6} entries  {report_stats.format_duration(seconds, pad_hours=False):>11}")
+    total_entries = sum(count for count, _ in results.values())
+    total_seconds = sum(seconds for _, seconds in results.values())
+    print(f"\n✅ {total_entries} entries, {report_stats.format_duration(total_seconds, pad_hours=False)} "
+          f"across {len(reports)} reports (loaded in {load_ms:.1f} ms, {rebuilt} read from CSV, query {query_ms:.1f} ms)")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
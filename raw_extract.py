@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Fast entry extraction from the PDF's own text stream (pypdfium2).
+
+pdfplumber rebuilds visual lines by clustering every character on the
+page, which is most of what an extraction costs. Toggl's exports don't
+need that: in content-stream order, which PDFium returns without any
+layout analysis, every entry is one block. The block holds the
+description lines, then "<duration> <member>", then the "• project" and
+"• client" cells, the tags, the time range, and finally the date line:
+
+    Manípulos - Integración GLB
+    - Añadir posibilidad de
+    eliminar zona seleccionada
+    0:39:54 Alberto • Contour: P0001
+    • Intek Medical
+    10:18 - 10:58
+    10/20/2025 -
+
+The cells come out in the same order whatever the column layout, so the
+entries have the same fields as layout_extract's: the full description,
+the client as the project, and the tags.
+
+Nothing here checks the stream against the page geometry, so the result
+is only trusted when it reconciles with the header total exactly (see
+reconciles()). extract_intek_final --engine raw falls back on pdfplumber
+otherwise.
+"""
+import re
+import time
+
+import report_stats
+from roster import PROJECT, default_roster
+from time_entry import TimeEntry, date_ordinal
+
+# The duration can be glued to the description ("...WalletPoints2:14:00 Dani")
+DURATION_MEMBER_RE = re.compile(r'(?<!\d)(\d+):(\d{2}):(\d{2})\s+([^\d•\s][^•]*)')
+DURATION_ONLY_RE = re.compile(r'^(\d+):(\d{2}):(\d{2})$')
+DATE_LINE_RE = re.compile(r'^(\d{2})/(\d{2})/(\d{4})(.*)$')
+DATE_RE = re.compile(r'\d{2}/\d{2}/\d{4}')
+TIME_RANGE_RE = re.compile(r'(\d{2}):(\d{2})\s*-\s*(\d{2}):(\d{2})')
+PAGE_FOOTER_RE = re.compile(r'Page \d+/\d+$')
+TABLE_HEADER = 'DESCRIPTION DURATION'
+DEFAULT_TIME = '00:01'
+# PDFium marks a hyphen it joined across a line break with U+FFFE
+SOFT_HYPHEN = '￾'
+
+
+def _pypdfium2():
+    try:
+        import pypdfium2
+    except ImportError:
+        raise SystemExit('The raw engine needs pypdfium2 (installed with pdfplumber): pip install pypdfium2')
+    return pypdfium2
+
+
+def read_pages(pdf_path):
+    """[{'page': n, 'lines': [...], 'seconds': t}] straight from the text stream."""
+    pdfium = _pypdfium2()
+    pages = []
+    document = pdfium.PdfDocument(pdf_path)
+    try:
+        for index in range(len(document)):
+            start = time.perf_counter()
+            page = document[index]
+            text_page = page.get_textpage()
+            text = text_page.get_text_range()
+            text_page.close()
+            page.close()
+            pages.append({
+                'page': index + 1,
+                'lines': [line.replace(SOFT_HYPHEN, '-').strip() for line in text.splitlines()],
+                'seconds': time.perf_counter() - start,
+            })
+    finally:
+        document.close()
+    return pages
+
+
+def _split_client(text, roster):
+    """'Penguin PenguinAula_01_100' -> ('Penguin', 'PenguinAula_01_100') using the roster's projects."""
+    match = roster.pattern.match(text)
+    if match and roster.aliases[match.group(0)][0] == PROJECT:
+        return roster.aliases[match.group(0)][1], text[match.end():]
+    return roster.canonical_project(text), ''
+
+
+def _entry(block, date_match, roster):
+    """TimeEntry for a finished block: {'description', 'seconds', 'member', 'cells'}."""
+    cells = ' '.join(block['cells'])
+    time_match = TIME_RANGE_RE.search(cells)
+    if time_match:
+        start_time = f"{time_match.group(1)}:{time_match.group(2)}"
+        end_time = f"{time_match.group(3)}:{time_match.group(4)}"
+        cells = cells[:time_match.start()] + ' ' + cells[time_match.end():]
+    else:
+        start_time = end_time = DEFAULT_TIME
+
+    # "• project • client tags": the client is the last cell
+    parts = [part.strip() for part in cells.split('•')]
+    project, tags = _split_client(parts[-1], roster) if len(parts) > 1 else ('', parts[0])
+    # An entry running past midnight prints its end date after the start date
+    trailing = DATE_RE.sub(' ', date_match.group(4))
+    tags = ' '.join(word for word in (tags + ' ' + trailing).split() if word != '-')
+
+    description = ' '.join(' '.join(block['description']).split())
+    if len(description) < 3:
+        description = project
+    month, day, year = date_match.group(1), date_match.group(2), date_match.group(3)
+    return TimeEntry(description, block['seconds'], block['member'], project,
+                     date_ordinal(f"{year}-{month}-{day}"), start_time, end_time, tags)
+
+
+def parse_pages(pages, roster=None):
+    """(entries, reconciliation) from read_pages() output.
+
+    reconciliation has the shape of toggl_parser.new_reconciliation();
+    unmatched lists the entry blocks that never reached a date line.
+    """
+    roster = roster or default_roster()
+    entries = []
+    reconciliation = {'header_total': None, 'entries_total': 0, 'delta': None, 'unmatched': [], 'explained': False}
+    in_table = False
+    description = []
+    block = None
+    previous = ''
+
+    def drop(block):
+        reconciliation['unmatched'].append({'line': block['line'], 'page': block['page'], 'page_line': block['page_line'],
+                                            'text': block['text'], 'seconds': block['seconds'], 'kind': 'no date'})
+
+    index = 0
+    for page in pages:
+        for page_line, text in enumerate(page['lines'], start=1):
+            index += 1
+            if not text:
+                continue
+            if reconciliation['header_total'] is None and previous == 'Total Hours':
+                total = DURATION_ONLY_RE.match(text)
+                if total:
+                    reconciliation['header_total'] = report_stats.hms_seconds(*total.groups())
+            previous = text
+            if text.startswith(TABLE_HEADER):
+                in_table = True
+                description = []
+                continue
+            if not in_table or text.startswith('All time entries') or PAGE_FOOTER_RE.search(text):
+                continue
+
+            entry_match = DURATION_MEMBER_RE.search(text)
+            if entry_match:
+                if block is not None:
+                    drop(block)
+                h, m, s, member = entry_match.groups()
+                block = {
+                    'description': description + [text[:entry_match.start()]],
+                    'seconds': report_stats.hms_seconds(h, m, s),
+                    'member': roster.canonical_member(member.strip()),
+                    'cells': [text[entry_match.end():]],
+                    'line': index - 1, 'page': page['page'], 'page_line': page_line, 'text': text,
+                }
+                description = []
+                continue
+
+            date_match = DATE_LINE_RE.match(text)
+            if block is None:
+                description.append(text)
+            elif date_match:
+                entry = _entry(block, date_match, roster)
+                entries.append(entry)
+                reconciliation['entries_total'] += entry.seconds
+                block = None
+            else:
+                block['cells'].append(text)
+    if block is not None:
+        drop(block)
+
+    if reconciliation['header_total'] is not None:
+        delta = reconciliation['header_total'] - reconciliation['entries_total']
+        reconciliation['delta'] = delta
+        reconciliation['explained'] = delta == sum(c['seconds'] for c in reconciliation['unmatched'])
+    return entries, reconciliation
+
+
+def reconciles(reconciliation):
+    """Whether every block became an entry and they add up to the header total."""
+    return reconciliation['delta'] == 0 and not reconciliation['unmatched']
+
+
+def extract_entries(pdf_path, roster=None):
+    """Return (entries, reconciliation) for pdf_path; see parse_pages()."""
+    return parse_pages(read_pages(pdf_path), roster)
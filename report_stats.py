@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Columnar aggregation of parsed time entries.
+
+Entries are folded into parallel typed arrays (integer seconds, member
+code, description code) as they arrive, so totals and group-bys are a
+sum/bincount over those arrays instead of repeated string parsing over a
+list of dicts. NumPy is used for the group-bys when it is installed; the
+array-only fallback gives the same numbers.
+"""
+from array import array
+
+import time_entry
+
+_numpy = False
+
+
+def _np():
+    """numpy if installed, else None; imported on the first group-by."""
+    global _numpy
+    if _numpy is False:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy = numpy
+    return _numpy
+
+
+def hms_seconds(hours, minutes, seconds='0'):
+    """Hours, minutes and seconds as digit strings (a duration regex's groups) -> integer seconds."""
+    return int(hours) * 3600 + int(minutes) * 60 + int(seconds)
+
+
+def duration_seconds(duration):
+    """'H:MM:SS' or 'H:MM' -> integer seconds (0 for empty/invalid)."""
+    if not duration:
+        return 0
+    parts = duration.replace(' ', '').split(':')
+    try:
+        if len(parts) in (2, 3):
+            return hms_seconds(*parts)
+    except ValueError:
+        pass
+    return 0
+
+
+def format_duration(seconds, pad_hours=True):
+    hours = seconds // 3600
+    minutes = (seconds % 3600) // 60
+    if pad_hours:
+        return f"{hours:02d}:{minutes:02d}:{seconds % 60:02d}"
+    return f"{hours}:{minutes:02d}:{seconds % 60:02d}"
+
+
+def entry_seconds(entry):
+    """Seconds carried by the parser, parsing the duration string only as a fallback."""
+    seconds = entry.get('seconds')
+    if seconds is None:
+        seconds = duration_seconds(entry.get('duration', ''))
+    return seconds
+
+
+class EntryColumns:
+    """Append-only columnar store of the fields the summaries group by."""
+
+    def __init__(self):
+        self.seconds = array('q')
+        self.member_codes = array('q')
+        self.desc_codes = array('q')
+        self.members = []
+        self.descriptions = []
+        self._member_index = {}
+        self._desc_index = {}
+
+    def __len__(self):
+        return len(self.seconds)
+
+    def append(self, entry):
+        entry = time_entry.record(entry)
+        self.seconds.append(entry.seconds)
+
+        member = entry.member
+        code = self._member_index.get(member)
+        if code is None:
+            code = self._member_index[member] = len(self.members)
+            self.members.append(member)
+        self.member_codes.append(code)
+
+        # Descriptions group case-insensitively; the first spelling seen is kept
+        desc = entry.description.strip()
+        key = desc.lower()
+        code = self._desc_index.get(key)
+        if code is None:
+            code = self._desc_index[key] = len(self.descriptions)
+            self.descriptions.append(desc)
+        self.desc_codes.append(code)
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    def total_seconds(self):
+        return sum(self.seconds)
+
+    def _group(self, codes, size, weights=None):
+        np = _np() if len(codes) else None
+        if np is not None:
+            codes = np.frombuffer(codes, dtype=np.int64)
+            if weights is not None:
+                weights = np.frombuffer(weights, dtype=np.int64)
+            return [int(v) for v in np.bincount(codes, weights=weights, minlength=size)]
+        totals = [0] * size
+        if weights is None:
+            for code in codes:
+                totals[code] += 1
+        else:
+            for code, weight in zip(codes, weights):
+                totals[code] += weight
+        return totals
+
+    def member_counts(self):
+        counts = self._group(self.member_codes, len(self.members))
+        return dict(zip(self.members, counts))
+
+    def description_totals(self):
+        """[(description, entry count, total seconds)] in first-seen order."""
+        size = len(self.descriptions)
+        counts = self._group(self.desc_codes, size)
+        seconds = self._group(self.desc_codes, size, self.seconds)
+        return list(zip(self.descriptions, counts, seconds))
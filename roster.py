@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Team members and projects known to the report parsers.
+
+The roster is loaded from roster.json (or the file named by the
+TOGGL_ROSTER environment variable):
+
+    {
+      "members": {"Alberto": ["Jordi"], "Dani": [], "Joan": []},
+      "projects": {"Intek Medical": [], "Penguin": []},
+      "entry_line_names": ["Dani", "Alberto"]
+    }
+
+Each key is the canonical name and its list holds the aliases that should
+be reported as it. Every name and alias is compiled into one regex, so a
+single scan of a line finds its canonical member and project; member-only
+lookups (the parsers' hot path) use a second regex over the member aliases.
+
+entry_line_names is a compatibility setting: a neighbouring line with a
+duration and one of these names (plain substrings, not whole words) is
+another entry rather than description text. It defaults to every member
+name and alias; roster.json pins it to the two names the original parser
+hardcoded, so the parsers' output stays what it was.
+"""
+import json
+import os
+import re
+
+ROSTER_PATH = os.environ.get('TOGGL_ROSTER') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'roster.json')
+
+MEMBER = 'member'
+PROJECT = 'project'
+
+
+class Roster:
+    """Compiled alias table: alias -> (kind, canonical name)."""
+
+    def __init__(self, members, projects=None, entry_line_names=None):
+        self.aliases = {}
+        for kind, table in ((PROJECT, projects or {}), (MEMBER, members)):
+            for canonical, aliases in table.items():
+                for alias in [canonical] + list(aliases):
+                    self.aliases[alias] = (kind, canonical)
+        self.members = sorted(set(canonical for kind, canonical in self.aliases.values() if kind == MEMBER))
+        self.projects = sorted(set(canonical for kind, canonical in self.aliases.values() if kind == PROJECT))
+        self.member_aliases = {alias: canonical for alias, (kind, canonical) in self.aliases.items() if kind == MEMBER}
+        self.pattern = _alternation(self.aliases)
+        self.member_pattern = _alternation(self.member_aliases)
+        if entry_line_names is None:
+            entry_line_names = self.member_aliases
+        self.entry_line_pattern = _alternation(entry_line_names, whole_words=False)
+
+    def scan(self, text):
+        """(member, project) canonical names found in text, either may be None."""
+        member = project = None
+        for match in self.pattern.finditer(text):
+            kind, canonical = self.aliases[match.group(0)]
+            if kind == MEMBER:
+                if member is None:
+                    member = canonical
+                    if project is not None:
+                        break
+            elif project is None:
+                project = canonical
+                if member is not None:
+                    break
+        return member, project
+
+    def find_member(self, text):
+        """First member named in text (canonical), or None."""
+        match = self.member_pattern.search(text)
+        return self.member_aliases[match.group(0)] if match else None
+
+    def has_member(self, text):
+        return self.member_pattern.search(text) is not None
+
+    def names_entry_line(self, text):
+        """Whether text has one of the entry_line_names (see the module docstring)."""
+        return self.entry_line_pattern.search(text) is not None
+
+    def strip_members(self, text):
+        """text with every member name or alias removed."""
+        return self.member_pattern.sub('', text)
+
+    def canonical_member(self, name):
+        kind, canonical = self.aliases.get(name, (None, None))
+        return canonical if kind == MEMBER else name
+
+    def canonical_project(self, name):
+        kind, canonical = self.aliases.get(name, (None, None))
+        return canonical if kind == PROJECT else name
+
+
+def _alternation(names, whole_words=True):
+    # Longest name first so "Intek Medical" wins over a shorter prefix;
+    # a pattern that never matches when the table is empty
+    names = sorted(names, key=len, reverse=True)
+    if not names:
+        return re.compile(r'(?!)')
+    pattern = '|'.join(re.escape(name) for name in names)
+    return re.compile(r'\b(?:' + pattern + r')\b' if whole_words else pattern)
+
+
+def load(path=ROSTER_PATH):
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    return Roster(config.get('members', {}), config.get('projects', {}), config.get('entry_line_names'))
+
+
+_default = None
+
+
+def default_roster():
+    """The roster from ROSTER_PATH, loaded and compiled on first use."""
+    global _default
+    if _default is None:
+        _default = load()
+    return _default
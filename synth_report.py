@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""Synthetic Toggl "Detailed report" generator for load and recall testing.
+
+Produces the text lines pdfplumber extracts from a real Intek-style
+export (summary header, per-page table headers and footers, wrapped
+descriptions, optional missing time ranges) together with a ground-truth
+CSV of the entries that were rendered. Everything is derived from a
+seed, so a million-entry report is streamed twice (once for the header
+total, once to render) instead of being held in memory.
+
+    python synth_report.py --entries 100000 --lines synth.txt --truth synth_truth.csv --check
+    python synth_report.py --entries 500 --pdf synth.pdf        # needs reportlab
+    python synth_report.py --entries 100000 --export synth.jsonl   # as a Toggl export
+"""
+import argparse
+import csv
+import datetime
+import json
+import random
+import textwrap
+import time
+from collections import Counter
+
+import report_stats
+from toggl_parser import DANGLING_DASH_RE, DEFAULT_TIME
+
+DEFAULT_MEMBERS = ['Alberto', 'Dani']
+DEFAULT_PROJECTS = ['Contour: P0001', 'APP paciente: P0002', 'Connected: P0008', 'APP Vision: P0009']
+DEFAULT_CLIENT = 'Intek Medical'
+ENTRIES_PER_PAGE = 12
+# Width (in characters) at which the DESCRIPTION column wraps
+DESCRIPTION_WIDTH = 26
+TABLE_HEADER = 'DESCRIPTION DURATION MEMBER PROJECT TIME | DATE TAGS'
+# Toggl Track's detailed CSV export
+TOGGL_CSV_HEADER = ['User', 'Email', 'Client', 'Project', 'Task', 'Description', 'Billable', 'Start date',
+                    'Start time', 'End date', 'End time', 'Duration', 'Tags', 'Amount ()']
+
+TASK_VERBS = ['Revisión', 'Maquetación', 'Ajustes', 'Insertar endpoint', 'Integración', 'Análisis',
+              'Reunión', 'Despliegue', 'Investigación', 'Conexión con API', 'Tratamientos', 'Soporte']
+TASK_TOPICS = ['Login', 'Registro', 'Gráficas', 'Conexión wifi', 'Zonas disponibles', 'Dashboard',
+               'GLB de manípulo', 'modelo GLB', 'Alertas', 'Header', 'teclado virtual', 'Cards Modales',
+               'buscador de clínicas', 'Reporte Mensual', 'Consentimiento de paciente', 'Play Store']
+
+
+def format_date(day):
+    return day.strftime('%m/%d/%Y')
+
+
+def generate_entries(count, seed=0, members=None, projects=None, client=DEFAULT_CLIENT,
+                     end_date=datetime.date(2025, 10, 29), missing_time_rate=0.0):
+    """Yield `count` entries in report order (newest first), deterministically from seed."""
+    rng = random.Random(seed)
+    members = members or DEFAULT_MEMBERS
+    projects = projects or DEFAULT_PROJECTS
+    day = end_date
+    for _ in range(count):
+        if rng.random() < 0.3:
+            day -= datetime.timedelta(days=rng.randint(1, 3))
+        words = [rng.choice(TASK_VERBS)]
+        for _ in range(rng.choice([0, 0, 1, 1, 2, 3])):
+            words.append(rng.choice(['-', 'de', 'y', 'con']) + ' ' + rng.choice(TASK_TOPICS))
+        seconds = rng.randint(5 * 60, 5 * 3600)
+        start_minute = rng.randint(6 * 60, 23 * 60 - 1 - seconds // 60)
+        has_time = rng.random() >= missing_time_rate
+        end_minute = start_minute + seconds // 60
+        yield {
+            'description': ' '.join(words),
+            'seconds': seconds,
+            'member': rng.choice(members),
+            'project': rng.choice(projects),
+            'client': client,
+            'date': day,
+            'start_time': f"{start_minute // 60:02d}:{start_minute % 60:02d}" if has_time else '',
+            'end_time': f"{end_minute // 60:02d}:{end_minute % 60:02d}" if has_time else '',
+        }
+
+
+def entry_lines(entry):
+    """Text lines of one table row, wrapped the way pdfplumber reads Toggl's layout."""
+    chunks = textwrap.wrap(entry['description'], DESCRIPTION_WIDTH)
+    duration = report_stats.format_duration(entry['seconds'], pad_hours=False)
+    time_range = f" {entry['start_time']} - {entry['end_time']}" if entry['start_time'] else ''
+    project_line = f"{entry['project']}{time_range}"
+    client_line = f"• {entry['client']} {format_date(entry['date'])}"
+    member_part = f"{duration} {entry['member']} -"
+
+    if len(chunks) == 1:
+        return ['•', project_line, f"{chunks[0]} {member_part}", client_line]
+    if len(chunks) == 2:
+        return ['•', f"{chunks[0]} {project_line}", member_part, f"{chunks[1]} {client_line}"]
+    return [f"{chunks[0]} •", project_line, f"{chunks[1]} {member_part}", client_line] + chunks[2:]
+
+
+def render_lines(count, seed=0, entries_per_page=ENTRIES_PER_PAGE, **options):
+    """Yield the report's text lines page by page (see generate_entries for options)."""
+    total = 0
+    first_day = last_day = None
+    for entry in generate_entries(count, seed, **options):
+        total += entry['seconds']
+        last_day = last_day or entry['date']
+        first_day = entry['date']
+    first_day = first_day or datetime.date.today()
+    last_day = last_day or first_day
+    span = f"{format_date(first_day)} to {format_date(last_day)}"
+    days = (last_day - first_day).days + 1
+    pages = max(1, -(-count // entries_per_page))
+
+    yield f"Detailed report (from {span})"
+    yield f"{format_date(first_day)} - {format_date(last_day)}"
+    yield f"Clientis {options.get('client', DEFAULT_CLIENT)}"
+    yield 'Summary'
+    yield 'Total Hours Billable Hours Amount Average Daily Hours'
+    yield f"{report_stats.format_duration(total, pad_hours=False)} - - {total / 3600 / days:.2f} Hours"
+
+    page = 1
+    on_page = 0
+    yield f"All time entries from {span}"
+    yield TABLE_HEADER
+    for entry in generate_entries(count, seed, **options):
+        if on_page == entries_per_page:
+            yield f"Tres Puntos Page {page}/{pages}"
+            page += 1
+            on_page = 0
+            yield f"All time entries from {span}"
+            yield TABLE_HEADER
+        yield from entry_lines(entry)
+        on_page += 1
+    yield f"Tres Puntos Page {page}/{pages}"
+
+
+def parsed_description(entry):
+    """The description the parser recovers from entry_lines(entry).
+
+    pdfplumber interleaves the columns, so the parser sees the description
+    chunk that shares a line with the project or the duration (the second
+    one once the description wraps to three lines) followed by the project.
+    A chunk on the duration line loses a dangling '-', like any text before
+    a duration.
+    """
+    chunks = textwrap.wrap(entry['description'], DESCRIPTION_WIDTH)
+    if len(chunks) == 2:
+        return f"{chunks[0]} {entry['project']}"
+    inline = chunks[1] if len(chunks) > 2 else chunks[0]
+    return f"{DANGLING_DASH_RE.sub('', inline)} {entry['project']}"
+
+
+def truth_row(entry):
+    """Ground-truth CSV row, in the parser's conventions: Project holds the
+    client, as in the extracted CSVs, and an entry without a time range gets
+    the placeholder times."""
+    return [
+        parsed_description(entry),
+        report_stats.format_duration(entry['seconds']),
+        entry['member'],
+        entry['client'],
+        entry['date'].isoformat(),
+        entry['start_time'] or DEFAULT_TIME,
+        entry['end_time'] or DEFAULT_TIME,
+        '',
+    ]
+
+
+def write_truth(path, count, seed=0, **options):
+    import extract_intek_final
+
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(extract_intek_final.CSV_HEADER)
+        for entry in generate_entries(count, seed, **options):
+            writer.writerow(truth_row(entry))
+
+
+def _moments(entry):
+    """(start, stop) datetimes of a generated entry; 00:00 when it has no time range."""
+    start = datetime.datetime.combine(entry['date'], datetime.time.fromisoformat(entry['start_time'] or '00:00'))
+    return start, start + datetime.timedelta(seconds=entry['seconds'])
+
+
+def toggl_csv_row(entry):
+    """Row of Toggl's detailed CSV export (TOGGL_CSV_HEADER)."""
+    start, stop = _moments(entry)
+    return [entry['member'], '', entry['client'], entry['project'], '', entry['description'], 'No',
+            start.date().isoformat(), start.strftime('%H:%M:%S'), stop.date().isoformat(), stop.strftime('%H:%M:%S'),
+            report_stats.format_duration(entry['seconds']), '', '']
+
+
+def api_record(entry, entry_id=0):
+    """Toggl API v9 time entry, with the names the app adds (project_name, client_name, user_name)."""
+    start, stop = _moments(entry)
+    return {
+        'id': entry_id, 'wid': 1, 'pid': None, 'billable': False,
+        'start': start.isoformat() + '+00:00', 'stop': stop.isoformat() + '+00:00',
+        'duration': entry['seconds'], 'description': entry['description'], 'tags': [],
+        'project_name': entry['project'], 'client_name': entry['client'], 'user_name': entry['member'],
+    }
+
+
+def write_export(path, fmt, count, seed=0, **options):
+    """Write the generated entries as an input_adapters format: csv, toggl-csv, json or jsonl."""
+    import extract_intek_final
+
+    entries = generate_entries(count, seed, **options)
+    if fmt in ('csv', 'toggl-csv'):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if fmt == 'csv':
+                writer.writerow(extract_intek_final.CSV_HEADER)
+                writer.writerows(truth_row(entry) for entry in entries)
+            else:
+                writer.writerow(TOGGL_CSV_HEADER)
+                writer.writerows(toggl_csv_row(entry) for entry in entries)
+    elif fmt == 'json':
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump([api_record(entry, index) for index, entry in enumerate(entries)], f, ensure_ascii=False)
+    elif fmt == 'jsonl':
+        with open(path, 'w', encoding='utf-8') as f:
+            for index, entry in enumerate(entries):
+                f.write(json.dumps(api_record(entry, index), ensure_ascii=False) + '\n')
+    else:
+        raise ValueError(f"Unknown export format {fmt}")
+    return path
+
+
+def write_pdf(lines, path, lines_per_page=70):
+    """Render text lines to a PDF, one report page per PDF page. Needs reportlab."""
+    try:
+        from reportlab.lib.pagesizes import A4
+        from reportlab.pdfgen import canvas
+    except ImportError:
+        raise SystemExit('PDF output needs reportlab: pip install reportlab')
+
+    pdf = canvas.Canvas(path, pagesize=A4)
+    width, height = A4
+    y = height - 30
+    used = 0
+    for line in lines:
+        if used == lines_per_page:
+            pdf.showPage()
+            y = height - 30
+            used = 0
+        pdf.setFont('Helvetica', 8)
+        pdf.drawString(25, y, line)
+        y -= 11
+        used += 1
+        if line.startswith('Tres Puntos Page'):
+            used = lines_per_page
+    pdf.save()
+
+
+def entry_key(description, seconds, member, date, start_time, end_time):
+    """Fields a parsed entry must reproduce exactly to count as recalled."""
+    return (description, seconds, member, date, start_time, end_time)
+
+
+def check(count, seed=0, entries_per_page=ENTRIES_PER_PAGE, **options):
+    """Parse the synthetic report with toggl_parser and measure speed and recall."""
+    import toggl_parser
+
+    expected = Counter(
+        entry_key(parsed_description(e), e['seconds'], e['member'], e['date'].isoformat(),
+                  e['start_time'] or DEFAULT_TIME, e['end_time'] or DEFAULT_TIME)
+        for e in generate_entries(count, seed, **options)
+    )
+    start = time.perf_counter()
+    parsed = Counter(
+        entry_key(e.description, e.seconds, e.member, e.date, e.start_time, e.end_time)
+        for e in toggl_parser.iter_entries(render_lines(count, seed, entries_per_page, **options))
+    )
+    elapsed = time.perf_counter() - start
+    matched = sum((expected & parsed).values())
+    return {
+        'entries': count,
+        'parsed': sum(parsed.values()),
+        'matched': matched,
+        'recall': matched / count if count else 1.0,
+        'precision': matched / sum(parsed.values()) if parsed else 1.0,
+        'seconds': elapsed,
+        'entries_per_second': count / elapsed if elapsed else None,
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Generate a synthetic Toggl detailed report')
+    arg_parser.add_argument('-n', '--entries', type=int, default=1000)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--members', nargs='+', default=DEFAULT_MEMBERS)
+    arg_parser.add_argument('--projects', nargs='+', default=DEFAULT_PROJECTS)
+    arg_parser.add_argument('--client', default=DEFAULT_CLIENT)
+    arg_parser.add_argument('--missing-time-rate', type=float, default=0.0,
+                            help='fraction of entries rendered without a start/end time')
+    arg_parser.add_argument('--entries-per-page', type=int, default=ENTRIES_PER_PAGE)
+    arg_parser.add_argument('--lines', help='write the extracted-text lines here')
+    arg_parser.add_argument('--truth', help='write the ground-truth CSV here')
+    arg_parser.add_argument('--pdf', help='also render a PDF (needs reportlab)')
+    arg_parser.add_argument('--export', metavar='PATH',
+                            help='write the entries as a Toggl export (.json, .jsonl, or a Toggl detailed .csv)')
+    arg_parser.add_argument('--check', action='store_true', help='parse the report and report speed and recall')
+    args = arg_parser.parse_args()
+
+    options = {
+        'members': args.members,
+        'projects': args.projects,
+        'client': args.client,
+        'missing_time_rate': args.missing_time_rate,
+    }
+    render = lambda: render_lines(args.entries, args.seed, args.entries_per_page, **options)
+
+    if args.lines:
+        with open(args.lines, 'w', encoding='utf-8') as f:
+            for line in render():
+                f.write(line + '\n')
+        print(f"✅ Lines saved to {args.lines}")
+    if args.truth:
+        write_truth(args.truth, args.entries, args.seed, **options)
+        print(f"✅ Ground truth saved to {args.truth}")
+    if args.pdf:
+        write_pdf(render(), args.pdf)
+        print(f"✅ PDF saved to {args.pdf}")
+    if args.export:
+        fmt = 'jsonl' if args.export.endswith('.jsonl') else 'json' if args.export.endswith('.json') else 'toggl-csv'
+        write_export(args.export, fmt, args.entries, args.seed, **options)
+        print(f"✅ {fmt} export saved to {args.export}")
+    if args.check:
+        result = check(args.entries, args.seed, entries_per_page=args.entries_per_page, **options)
+        print(f"Parsed {result['parsed']} of {result['entries']} entries in {result['seconds']:.2f}s "
+              f"({result['entries_per_second']:,.0f} entries/s)")
+        print(f"Recall {result['recall']:.4%}, precision {result['precision']:.4%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Compact record for one parsed time entry.
+
+The parsers used to emit an 8-9 key dict per entry, each holding its own
+copies of the date, times and duration text. A TimeEntry has fixed slots
+instead: integer seconds, the date as a proleptic ordinal (0 when the
+entry has none, the text itself when it isn't a valid date) and member, project, times and tags interned, so a
+report's few distinct values are stored once however many entries repeat
+them. The date and duration text are rebuilt on access, from small
+caches, for the CSV writer and anything else that wants strings.
+
+Code that also accepts plain entry dicts (dedup, an older cache, the
+legacy parser) converts them at the boundary with record().
+"""
+import datetime
+import functools
+import sys
+
+import report_stats
+
+
+@functools.lru_cache(maxsize=4096)
+def date_ordinal(date):
+    """'YYYY-MM-DD' -> date ordinal (0 for no date).
+
+    A date that doesn't parse (a DD/MM report read as MM/DD gives
+    '2025-25-10') is returned as is, so the CSV still gets the report's
+    text, and reported on stderr once per distinct text.
+    """
+    if not date:
+        return 0
+    try:
+        return datetime.date.fromisoformat(date).toordinal()
+    except ValueError:
+        print(f"⚠️  Invalid date {date!r}, kept as text", file=sys.stderr)
+        return date
+
+
+@functools.lru_cache(maxsize=4096)
+def date_text(day):
+    """Date ordinal -> 'YYYY-MM-DD' ('' for 0, the text for an invalid date)."""
+    if isinstance(day, str):
+        return day
+    return datetime.date.fromordinal(day).isoformat() if day else ''
+
+
+class TimeEntry:
+    """One time entry: description, seconds, member, project, day, times and tags."""
+
+    __slots__ = ('description', 'seconds', 'member', 'project', 'day', 'start_time', 'end_time', 'tags')
+
+    def __init__(self, description, seconds, member, project, day, start_time, end_time, tags=''):
+        self.description = description
+        self.seconds = seconds
+        self.member = sys.intern(member)
+        self.project = sys.intern(project)
+        self.day = day
+        self.start_time = sys.intern(start_time)
+        self.end_time = sys.intern(end_time)
+        self.tags = sys.intern(tags)
+
+    @property
+    def date(self):
+        return date_text(self.day)
+
+    @property
+    def duration(self):
+        return report_stats.format_duration(self.seconds)
+
+    def __eq__(self, other):
+        if not isinstance(other, TimeEntry):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in TimeEntry.__slots__)
+
+    def __hash__(self):
+        return hash(tuple(getattr(self, name) for name in TimeEntry.__slots__))
+
+    def __repr__(self):
+        return (f"TimeEntry({self.description!r}, {self.seconds}, {self.member!r}, {self.project!r}, "
+                f"{self.date!r}, {self.start_time!r}, {self.end_time!r}, {self.tags!r})")
+
+    def as_dict(self):
+        """The entry dict the parsers used to return (without the raw duration text)."""
+        return {
+            'description': self.description,
+            'seconds': self.seconds,
+            'member': self.member,
+            'project': self.project,
+            'date': self.date,
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            'tags': self.tags,
+        }
+
+    @classmethod
+    def from_dict(cls, entry):
+        return cls(entry.get('description', ''), report_stats.entry_seconds(entry), entry.get('member', ''),
+                   entry.get('project', ''), date_ordinal(entry.get('date', '')), entry.get('start_time', ''),
+                   entry.get('end_time', ''), entry.get('tags', ''))
+
+
+def record(entry):
+    """entry as a TimeEntry, converting an entry dict."""
+    return entry if isinstance(entry, TimeEntry) else TimeEntry.from_dict(entry)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""One entry point for the extraction and diagnostic scripts.
+
+    python toggl_cli.py extract --pdf reportes_csv/intek-medical-final.pdf
+    python toggl_cli.py extract --input toggl_export.json -o entries.csv
+    python toggl_cli.py verify --csv reportes_csv/intek_medical_final_data.csv
+    python toggl_cli.py diagnose --json diagnostics.json
+    python toggl_cli.py find-missing
+    python toggl_cli.py check-durations
+    python toggl_cli.py debug-dates
+    python toggl_cli.py query --by member
+    python toggl_cli.py --startup-times          # measure each subcommand's startup
+
+Only the chosen subcommand's module is imported, and pdfplumber, pyarrow
+and numpy are imported inside the functions that use them, so a
+subcommand served from the extracted-lines cache or working on CSVs
+never loads them. Everything after the subcommand name is passed to that
+script's own argument parser.
+"""
+import importlib
+import sys
+
+# subcommand -> (module with a main(), description)
+COMMANDS = {
+    'extract': ('extract_intek_final', 'extract entries from a PDF report or Toggl CSV/JSON export to CSV/Parquet/Arrow'),
+    'verify': ('verify_csv', 'compare an extracted CSV against the header total'),
+    'diagnose': ('diagnostics', 'classify every duration line and explain the header total difference'),
+    'find-missing': ('find_missing', 'duration lines with a member nearby that are not captured'),
+    'check-durations': ('check_all_durations', 'totals of duration lines on or near a member'),
+    'check-parsers': ('check_parsers', 'check that the fast parser returns the legacy parser\'s entries'),
+    'check-entries': ('check_entries', 'duration + member lines and their total'),
+    'debug-dates': ('debug_parsing', 'entries with no date nearby'),
+    'query': ('query_csv', 'totals and group-bys across report CSVs'),
+    'dedup': ('dedup', 'merge report versions, dropping duplicates and reporting overlaps'),
+    'tasks': ('desc_clusters', 'task totals with near-duplicate descriptions merged'),
+    'load': ('db_loader', 'load extracted entries into Postgres (or SQLite) without duplicates'),
+    'batch': ('batch_extract', 'convert a directory of PDFs'),
+    'serve': ('extract_service', 'local extraction service'),
+}
+# Imports a subcommand should only pay for when it actually needs them
+HEAVY_MODULES = ('pdfplumber', 'pdfminer', 'PIL', 'pyarrow', 'numpy')
+
+
+def run(command, argv):
+    module_name, _ = COMMANDS[command]
+    module = importlib.import_module(module_name)
+    sys.argv = [f"{sys.argv[0]} {command}"] + list(argv)
+    return module.main()
+
+
+def startup_times(repeat=5):
+    """Median wall time of `<command> --help` per subcommand, and which heavy modules it imported."""
+    import statistics
+    import subprocess
+    import time
+
+    results = {}
+    for command in COMMANDS:
+        args = [sys.executable, '-X', 'importtime', __file__, command, '--help']
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            done = subprocess.run(args, capture_output=True, text=True)
+            samples.append(time.perf_counter() - start)
+        imported = {line.rsplit('|', 1)[-1].strip() for line in done.stderr.splitlines() if line.startswith('import time:')}
+        heavy = sorted(name for name in HEAVY_MODULES if name in imported)
+        results[command] = (statistics.median(samples), heavy, done.returncode)
+    return results
+
+
+def usage():
+    lines = ["usage: toggl_cli.py <command> [options]   (toggl_cli.py <command> --help for its options)", "",
+             "commands:"]
+    width = max(len(command) for command in COMMANDS)
+    for command, (module_name, description) in COMMANDS.items():
+        lines.append(f"  {command:<{width}}  {description} ({module_name}.py)")
+    lines.append(f"\n  {'--startup-times':<{width}}  measure each command's startup time and heavy imports")
+    return '\n'.join(lines)
+
+
+def main():
+    argv = sys.argv[1:]
+    if argv and argv[0] in COMMANDS:
+        return run(argv[0], argv[1:])
+    if argv and argv[0] == '--startup-times':
+        repeat = int(argv[1]) if len(argv) > 1 else 5
+        # The median includes interpreter startup and -X importtime's own overhead
+        for command, (seconds, heavy, returncode) in startup_times(repeat).items():
+            mark = '✅' if not heavy and returncode == 0 else '⚠️ '
+            loaded = f"  loads {', '.join(heavy)}" if heavy else ''
+            print(f"{mark} {command:<16} {seconds * 1000:7.1f} ms{loaded}")
+        return 0
+    print(usage())
+    if argv and argv[0] not in ('-h', '--help'):
+        print(f"\nUnknown command: {argv[0]}")
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
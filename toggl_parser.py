@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""Single-pass parser for Toggl "Detailed report" text lines.
+
+Drop-in replacement for extract_intek_final.parse_entries: every line is
+cleaned and classified exactly once, then entries are assembled in one
+forward pass over a small window of already classified lines. The output
+is identical to the legacy parser, entry for entry (check_parsers.py
+verifies it). It is not meaningfully faster on real reports, where the
+legacy parser's rescans only cover the duration lines' neighbourhoods;
+what the single pass buys is streaming in constant memory and the
+reconciliation against the header total.
+
+As lines are classified each one is also linked to the nearest date line
+at or before it and at or after it (document line indices, filled in as
+the lines stream past), so resolving an entry's date and project is a
+couple of lookups instead of rescanning its neighbourhood.
+
+Member names and aliases come from the roster (see roster.py); pass a
+Roster to iter_entries to use a different one. Entries are TimeEntry
+records (see time_entry.py), equal field for field to the legacy
+parser's dicts.
+"""
+import re
+from collections import deque
+
+import report_stats
+from roster import default_roster
+from time_entry import TimeEntry, date_ordinal
+
+DURATION_RE = re.compile(r'(\d+):(\d{2}):(\d{2})')
+DATE_RE = re.compile(r'(\d{2})/(\d{2})/(\d{4})')
+DATE_ONLY_RE = re.compile(r'^\d{2}/\d{2}/\d{4}\s*$')
+TIME_RANGE_RE = re.compile(r'(\d{2}):(\d{2})\s*-\s*(\d{2}):(\d{2})')
+TIME_ONLY_RE = re.compile(r'^•?\s*\d{2}:\d{2}\s*-\s*\d{2}:\d{2}\s*$')
+INLINE_PROJECT_RE = re.compile(r'•\s*(\w+(?:\s+\w+)?)')
+PROJECT_MARKER_RE = re.compile(r'•\s*([^-]+?)(?:\s+\d{2}/\d{2}/\d{4})')
+TRAILING_DATE_RE = re.compile(r'\s+\d{2}/\d{2}/\d{4}\s*$')
+TIME_RANGE_STRIP_RE = re.compile(r'\s*\d{2}:\d{2}\s*-\s*\d{2}:\d{2}')
+DATE_SUFFIX_RE = re.compile(r'\s+\d{2}/\d{2}/\d{4}.*$')
+BULLET_TAIL_RE = re.compile(r'•.*')
+DANGLING_DASH_RE = re.compile(r'\s*-\s*$')
+NON_DURATION_CHARS_RE = re.compile(r'[^\d:]')
+
+INLINE_SKIP_MARKERS = ('DESCRIPTION', 'DURATION', 'All time entries', 'Detailed report')
+DEFAULT_PROJECT = 'Intek Medical'
+DEFAULT_TIME = '00:01'
+
+# Lines needed on each side of a duration line to resolve its entry:
+# the widest date fallback looks 10 lines back and 9 lines ahead.
+LOOKBEHIND = 10
+LOOKAHEAD = 9
+
+
+class Line:
+    """Everything the entry assembler needs to know about one text line."""
+
+    __slots__ = (
+        'text', 'is_header', 'duration', 'seconds', 'duration_start', 'blocks_entry',
+        'member', 'has_total', 'has_description', 'has_bullet', 'date',
+        'time_range', 'project_marker', 'desc_checked', 'desc', 'desc_as_prev',
+        'inline_desc', 'inline_project', 'consumed', 'index', 'is_header_total',
+        'prev_date', 'next_date',
+    )
+
+
+def names_entry_line(text, roster):
+    """Whether text holds a duration and one of the roster's entry_line_names, i.e. is another entry."""
+    return roster.names_entry_line(text) and DURATION_RE.search(text) is not None
+
+
+def _description_candidate(text, roster):
+    """Text a neighbouring line contributes to a description, or None."""
+    candidate = text.replace('•', '').strip()
+    candidate = TRAILING_DATE_RE.sub('', candidate)
+    candidate = TIME_RANGE_STRIP_RE.sub('', candidate)
+    candidate = candidate.strip()
+    if not (candidate and any(c.isalpha() for c in candidate) and len(candidate) > 2):
+        return None
+    if names_entry_line(candidate, roster):
+        return None
+    return candidate
+
+
+def _inline_description(text, dur_start, roster):
+    """Description text sitting before the duration on the entry line."""
+    before = text[:dur_start].strip()
+    if not before:
+        return None
+    before = roster.strip_members(before)
+    before = BULLET_TAIL_RE.sub('', before)
+    before = DANGLING_DASH_RE.sub('', before)
+    before = before.strip()
+    if not (before and len(before) > 2 and any(c.isalpha() for c in before)):
+        return None
+    if any(marker in before for marker in INLINE_SKIP_MARKERS):
+        return None
+    return before
+
+
+def classify_line(raw, roster=None):
+    """Clean a raw text line and run every pattern the parser needs, once.
+
+    Cheap substring checks gate each regex so that most lines only pay for
+    one or two searches.
+    """
+    roster = roster or default_roster()
+    text = raw.replace('\x00', ' ').strip() if raw else ''
+    line = Line()
+    line.text = text
+    line.consumed = False
+    line.index = None
+    line.prev_date = None
+    line.next_date = None
+    line.is_header_total = False
+    line.is_header = (
+        'DESCRIPTION' in text or 'DURATION' in text or 'All time entries' in text
+        or 'Detailed report' in text or 'Summary' in text
+        or ('Page' in text and '/' in text)
+    )
+    line.has_total = 'Total' in text
+    line.blocks_entry = line.has_total or 'Billable' in text
+    line.has_description = 'DESCRIPTION' in text
+    line.has_bullet = '•' in text
+    line.desc_checked = False
+
+    line.member = roster.find_member(text) if text else None
+
+    line.date = None
+    line.project_marker = None
+    if '/' in text:
+        date_match = DATE_RE.search(text)
+        if date_match:
+            line.date = f"{date_match.group(3)}-{date_match.group(1)}-{date_match.group(2)}"
+            if line.has_bullet:
+                marker_match = PROJECT_MARKER_RE.search(text)
+                if marker_match:
+                    line.project_marker = roster.canonical_project(marker_match.group(1).strip())
+
+    line.time_range = None
+    line.duration = None
+    line.seconds = None
+    line.duration_start = None
+    line.inline_desc = None
+    line.inline_project = None
+    if ':' in text:
+        if '-' in text:
+            time_match = TIME_RANGE_RE.search(text)
+            if time_match:
+                line.time_range = (
+                    f"{time_match.group(1)}:{time_match.group(2)}",
+                    f"{time_match.group(3)}:{time_match.group(4)}",
+                )
+        dur_match = DURATION_RE.search(text)
+        if dur_match:
+            h, m, s = dur_match.groups()
+            line.duration = f"{h}:{m}:{s}"
+            line.seconds = report_stats.hms_seconds(h, m, s)
+            line.duration_start = dur_match.start()
+            line.inline_desc = _inline_description(text, dur_match.start(), roster)
+            if line.has_bullet:
+                project_match = INLINE_PROJECT_RE.search(text)
+                if project_match:
+                    line.inline_project = project_match.group(1)
+    return line
+
+
+def _neighbour_description(line, roster):
+    """Description candidates of a line, computed on first use and cached.
+
+    Returns (desc, desc_as_prev): the text the line contributes when it sits
+    two lines above an entry, and whether it also qualifies as the line
+    directly above (which additionally rejects time-only and DURATION lines).
+    """
+    if not line.desc_checked:
+        line.desc_checked = True
+        line.desc = None
+        line.desc_as_prev = False
+        text = line.text
+        if (text and not line.has_description and not text.startswith('•')
+                and not DATE_ONLY_RE.match(text)):
+            line.desc = _description_candidate(text, roster)
+            line.desc_as_prev = (
+                line.desc is not None
+                and not TIME_ONLY_RE.match(text)
+                and 'DURATION' not in text
+            )
+    return line.desc, line.desc_as_prev
+
+
+def _is_candidate(window, pos):
+    """Mirror of the legacy duration/member gate in parse_entries."""
+    line = window[pos]
+    if line.is_header or not line.duration or line.blocks_entry:
+        return False
+    if line.member:
+        return True
+    for j in range(max(0, pos - 3), min(len(window), pos + 4)):
+        if j != pos and not window[j].consumed:
+            nearby = window[j]
+            if nearby.member and not nearby.has_total:
+                return True
+    return False
+
+
+def _assemble(window, pos, roster):
+    """Build the entry for the duration line at window[pos], or None."""
+    line = window[pos]
+    size = len(window)
+
+    member = line.member
+    if not member:
+        for j in range(max(0, pos - 3), min(size, pos + 4)):
+            if j != pos:
+                nearby = window[j]
+                member = nearby.member
+                if member and not nearby.has_total and not nearby.has_description:
+                    break
+    if not member:
+        return None
+
+    project = line.inline_project or DEFAULT_PROJECT
+
+    desc_parts = []
+    if pos > 0:
+        desc, desc_as_prev = _neighbour_description(window[pos - 1], roster)
+        if desc_as_prev:
+            desc_parts.append(desc)
+        if pos > 1 and not desc_parts:
+            desc = _neighbour_description(window[pos - 2], roster)[0]
+            if desc is not None:
+                desc_parts.append(desc)
+
+    inline = line.inline_desc
+    if inline:
+        inline_lower = inline.lower()
+        if not any(inline_lower in part.lower() or part.lower() in inline_lower for part in desc_parts):
+            desc_parts.insert(0, inline)
+
+    description = ' '.join(desc_parts).strip() if desc_parts else None
+    if description:
+        description = ' '.join(description.split())
+        description = DATE_SUFFIX_RE.sub('', description)
+        description = description.strip()
+    if not description or len(description) < 3:
+        description = project
+
+    time_range = None
+    if pos > 0:
+        time_range = window[pos - 1].time_range
+    if not time_range:
+        time_range = line.time_range
+    start_time, end_time = time_range if time_range else (DEFAULT_TIME, DEFAULT_TIME)
+
+    # Project markers only occur on date lines, so the nearest date line
+    # also carries the project: first up to 7 lines ahead, then up to 4
+    # behind, then the first date line from 10 behind to 9 ahead.
+    date = ''
+    project_found = project
+    origin = pos - line.index  # window position of document line 0
+    ahead = window[pos + 1].next_date if pos + 1 < size else None
+    if ahead is not None and ahead <= line.index + 7:
+        ahead_line = window[origin + ahead]
+        date = ahead_line.date
+        if ahead_line.project_marker is not None:
+            project_found = ahead_line.project_marker
+
+    if not date and pos > 0:
+        behind = window[pos - 1].prev_date
+        if behind is not None and behind >= line.index - 4:
+            behind_line = window[origin + behind]
+            date = behind_line.date
+            if behind_line.project_marker is not None:
+                project_found = behind_line.project_marker
+
+    if not date:
+        nearest = window[max(0, pos - 10)].next_date
+        if nearest is not None and nearest <= line.index + 9:
+            date = window[origin + nearest].date
+
+    if not date:
+        return None
+
+    return TimeEntry(description, line.seconds, member, project_found if project_found else project,
+                     date_ordinal(date), start_time, end_time)
+
+
+def new_reconciliation():
+    """Reconciliation report filled in by iter_entries(..., reconciliation=...).
+
+    header_total: grand total printed under "Total Hours" (seconds), if seen
+    entries_total: sum of the parsed entries (seconds)
+    delta: header_total - entries_total, once the input is exhausted
+    unmatched: lines that look like an entry but produced none, as
+        {'line': index, 'text': ..., 'seconds': ..., 'kind': ...} where kind
+        is 'duration' (a clean H:MM:SS) or 'garbled' (a member line whose
+        duration is interleaved with description text)
+    explained: whether the unmatched seconds add up exactly to delta
+    """
+    return {'header_total': None, 'entries_total': 0, 'delta': None, 'unmatched': [], 'explained': False}
+
+
+def iter_entries(lines, reconciliation=None, roster=None):
+    """Yield entries from an iterable of raw text lines in a single pass.
+
+    Only LOOKBEHIND + LOOKAHEAD + 1 classified lines are held at a time, so
+    the input can be a generator over a document of any size. Pass a dict
+    from new_reconciliation() to have it filled in along the way.
+    """
+    for _, entry in iter_indexed_entries(lines, reconciliation, roster):
+        yield entry
+
+
+def iter_indexed_entries(lines, reconciliation=None, roster=None):
+    """iter_entries(), yielding (index of the duration line, entry) pairs."""
+    roster = roster or default_roster()
+    window = deque(maxlen=LOOKBEHIND + LOOKAHEAD + 1)
+    # Index (within window) of the next line waiting to be resolved
+    pending = 0
+    index = 0
+    last_date = None
+    # Lines still waiting for their next_date; older ones are out of reach
+    awaiting = deque(maxlen=window.maxlen)
+
+    for raw in lines:
+        if len(window) == window.maxlen:
+            pending -= 1
+        line = classify_line(raw, roster)
+        line.index = index
+        index += 1
+        if line.date:
+            last_date = line.index
+            for waiting in awaiting:
+                waiting.next_date = last_date
+            awaiting.clear()
+            line.next_date = last_date
+        else:
+            awaiting.append(line)
+        line.prev_date = last_date
+        if (reconciliation is not None and reconciliation['header_total'] is None
+                and line.duration_start == 0 and window and window[-1].text.startswith('Total Hours')):
+            reconciliation['header_total'] = line.seconds
+            line.is_header_total = True
+        window.append(line)
+        if len(window) - 1 - pending < LOOKAHEAD:
+            continue
+        # window[pending] now has its full lookahead available; the deque
+        # drops lines from the left so pos is always within LOOKBEHIND.
+        entry = _resolve(window, pending, reconciliation, roster)
+        if entry:
+            yield window[pending].index, entry
+        pending += 1
+
+    while pending < len(window):
+        entry = _resolve(window, pending, reconciliation, roster)
+        if entry:
+            yield window[pending].index, entry
+        pending += 1
+
+    if reconciliation is not None and reconciliation['header_total'] is not None:
+        delta = reconciliation['header_total'] - reconciliation['entries_total']
+        reconciliation['delta'] = delta
+        reconciliation['explained'] = delta == sum(c['seconds'] for c in reconciliation['unmatched'])
+
+
+def _resolve(window, pos, reconciliation, roster):
+    entry = _assemble(window, pos, roster) if _is_candidate(window, pos) else None
+    line = window[pos]
+    if entry:
+        line.consumed = True
+        if reconciliation is not None:
+            reconciliation['entries_total'] += entry.seconds
+    elif reconciliation is not None and not line.blocks_entry and not line.is_header_total:
+        if line.duration:
+            reconciliation['unmatched'].append(
+                {'line': line.index, 'text': line.text, 'seconds': line.seconds, 'kind': 'duration'})
+        elif line.member:
+            # Overlapping text can interleave the duration with the description
+            # ("getPatientMeasurementsEvolutio0n:4()3:17 Alberto -")
+            garbled = DURATION_RE.search(NON_DURATION_CHARS_RE.sub('', line.text))
+            if garbled:
+                reconciliation['unmatched'].append({
+                    'line': line.index, 'text': line.text,
+                    'seconds': report_stats.hms_seconds(*garbled.groups()), 'kind': 'garbled',
+                })
+    return entry
+
+
+def parse_entries(lines, roster=None):
+    return list(iter_entries(lines, roster=roster))
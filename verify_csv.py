@@ -1,37 +1,76 @@
 #!/usr/bin/env python3
-import csv
-import re
-
-csv_path = 'reportes_csv/intek_medical_final_data.csv'
-with open(csv_path, 'r', encoding='utf-8') as f:
-    reader = csv.DictReader(f)
-    entries = list(reader)
-
-total_sec = 0
-for e in entries:
-    d = e['Duration (HH:MM:SS)']
-    m = re.match(r'(\d+):(\d{2}):(\d{2})', d)
-    if m:
-        h, m_val, s = int(m.group(1)), int(m.group(2)), int(m.group(3))
-        total_sec += h*3600 + m_val*60 + s
-
-h = total_sec // 3600
-m = (total_sec % 3600) // 60
-s = total_sec % 60
-
-print(f'Total from CSV: {h}:{m:02d}:{s:02d}')
-print(f'Total entries: {len(entries)}')
-
-# Expected total
-expected_h, expected_m, expected_s = 483, 31, 35
-expected_total = expected_h * 3600 + expected_m * 60 + expected_s
-actual_total = total_sec
-difference = expected_total - actual_total
-
-diff_h = difference // 3600
-diff_m = (difference % 3600) // 60
-diff_s = difference % 60
-
-print(f'\nExpected: {expected_h}:{expected_m:02d}:{expected_s:02d}')
-print(f'Difference: {diff_h}:{diff_m:02d}:{diff_s:02d} ({difference} seconds)')
+import argparse
+import glob
+import os
 
+import query_csv
+import report_stats
+
+INTEK_CSV = 'reportes_csv/intek_medical_final_data.csv'
+
+def header_total(pdf_path):
+    """Total printed under "Total Hours" in the report PDF, in seconds (None if absent)."""
+    import pdf_lines
+    import toggl_parser
+
+    reconciliation = toggl_parser.new_reconciliation()
+    for _ in toggl_parser.iter_entries(pdf_lines.load_lines(pdf_path), reconciliation):
+        pass
+    return reconciliation['header_total']
+
+def source_pdf(csv_path):
+    """The report next to csv_path that extract_intek_final writes it from by default, or None."""
+    from extract_intek_final import default_output_path
+
+    csv_path = os.path.abspath(csv_path)
+    for pdf_path in sorted(glob.glob(os.path.join(os.path.dirname(csv_path), '*.pdf'))):
+        if default_output_path(pdf_path) == csv_path:
+            return pdf_path
+    return None
+
+def duration(text):
+    seconds = report_stats.duration_seconds(text)
+    if not seconds and text.strip('0:'):
+        raise argparse.ArgumentTypeError(f"not an H:MM:SS duration: {text!r}")
+    return seconds
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Check an extracted CSV against the report header total')
+    arg_parser.add_argument('--csv', default=INTEK_CSV, help='CSV to verify')
+    expected_group = arg_parser.add_mutually_exclusive_group()
+    expected_group.add_argument('--expected', metavar='H:MM:SS', type=duration,
+                                help='expected total')
+    expected_group.add_argument('--pdf', help='take the expected total from this report\'s header '
+                                              '(default: the report the CSV was extracted from, next to it)')
+    args = arg_parser.parse_args()
+
+    csv_path = args.csv
+    if args.expected is not None:
+        expected_total = args.expected
+    else:
+        pdf_path = args.pdf or source_pdf(csv_path)
+        if pdf_path is None:
+            arg_parser.error(f"no report found next to {csv_path}; pass --expected H:MM:SS or --pdf REPORT")
+        expected_total = header_total(pdf_path)
+        if expected_total is None:
+            print(f"⚠️  No header total found in {pdf_path}")
+            return 1
+
+    report, _ = query_csv.load_report(csv_path)
+    entries = report.columns['seconds']
+
+    total_sec = sum(entries)
+
+    print(f'Total from CSV: {report_stats.format_duration(total_sec, pad_hours=False)}')
+    print(f'Total entries: {len(entries)}')
+
+    difference = expected_total - total_sec
+    sign = '-' if difference < 0 else ''
+
+    print(f'\nExpected: {report_stats.format_duration(expected_total, pad_hours=False)}')
+    print(f'Difference: {sign}{report_stats.format_duration(abs(difference), pad_hours=False)} ({difference} seconds)')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())